@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Bulk Amortisation Schedule Engine
+Period-by-period balance, interest and principal for whole loan portfolios
+
+Vectorized across loans, following the helpers in australianPropertyData.js
+and financialCalculations.js:
+  - interest each period is max(0, balance - offset) * rate / periods_per_year
+    (calculateMonthlyInterest, generalised to the repayment frequency)
+  - during the IO period the scheduled repayment is the interest only
+    (calculateIOPayment); at the switch the P&I repayment is recalculated on the
+    balance over the remaining term (calculatePIAfterIO); a loan that is IO for
+    its whole term never switches and ends with its balance owing
+  - weekly and fortnightly repayments are the monthly repayment converted with
+    calculatePaymentByFrequency (monthly * 12 / 52 or / 26)
+  - extra repayments and offset contributions are monthly amounts spread over
+    each period; extra repayments come off the balance and shorten the term
+
+Loans are grouped by frequency and processed in chunks. Each period is
+aggregated into per-loan totals and per-year portfolio totals as it is
+produced, so full schedules are never held in memory. Pass on_period to stream
+the raw per-period arrays to your own consumer.
+
+Usage:
+    python amortisation_engine.py loans.csv --output loan_totals.csv [--yearly portfolio.csv]
+    python amortisation_engine.py --demo 100000
+
+Loan CSV columns: principal, interest_rate, and optionally term_years (default
+30), io_years, offset_balance, offset_contribution (monthly),
+extra_repayment (monthly), frequency (monthly/fortnightly/weekly).
+"""
+
+import argparse
+import csv
+import time
+
+import numpy as np
+
+import calc_engine
+
+# calculatePaymentByFrequency
+PERIODS_PER_YEAR = {'monthly': 12, 'fortnightly': 26, 'weekly': 52}
+DEFAULT_FREQUENCY = 'monthly'
+DEFAULT_CHUNK_SIZE = 50000
+
+# Balances below a cent are treated as repaid
+PAID_OFF = 0.005
+
+
+def _amortise_chunk(principal, annual_rate, term_years, io_years, offset_balance, offset_contribution,
+                    extra_repayment, periods_per_year, totals, yearly, rows, on_period=None):
+    """Step one chunk of same-frequency loans to payoff, aggregating as it goes"""
+    n = len(principal)
+    f = periods_per_year
+    period_rate = annual_rate / f
+    term_periods = np.round(term_years * f).astype(int)
+    io_periods = np.minimum(np.round(io_years * f).astype(int), term_periods)
+    contribution = offset_contribution * 12 / f
+    extra = extra_repayment * 12 / f
+
+    balance = principal.copy()
+    offset = offset_balance.copy()
+    payment = np.zeros(n)
+    total_interest = np.zeros(n)
+    total_principal = np.zeros(n)
+    payoff_period = np.where(balance <= PAID_OFF, 0, term_periods)
+    pi_payment = np.zeros(n)
+
+    for period in range(term_periods.max()):
+        active = (balance > PAID_OFF) & (period < term_periods)
+        if not active.any():
+            break
+
+        # IO to P&I switch (or start of a P&I loan): recalculate on the remaining term.
+        # A loan that is IO for its whole term never switches and ends with its balance owing
+        switching = active & (period == io_periods) & (io_periods < term_periods)
+        if switching.any():
+            monthly = calc_engine.mortgage_payment(
+                balance[switching], annual_rate[switching], (term_periods - period)[switching] * 12 / f)
+            payment[switching] = monthly * 12 / f
+            pi_payment[switching] = payment[switching]
+
+        interest = np.maximum(0, balance - offset) * period_rate
+        scheduled = np.where(period < io_periods, interest, payment)
+        repaid = np.where(active, np.minimum(balance, np.maximum(0, scheduled - interest) + extra), 0)
+        interest = np.where(active, interest, 0)
+
+        balance = balance - repaid
+        offset = offset + np.where(active, contribution, 0)
+        total_interest += interest
+        total_principal += repaid
+        payoff_period = np.where(active & (balance <= PAID_OFF), period + 1, payoff_period)
+
+        year = period // f
+        yearly['interest'][year] += interest.sum()
+        yearly['principal'][year] += repaid.sum()
+        if (period + 1) % f == 0:
+            open_loans = active & (balance > PAID_OFF)
+            yearly['balance'][year] += balance[open_loans].sum()
+            yearly['offset'][year] += offset[open_loans].sum()
+            yearly['loans'][year] += open_loans.sum()
+
+        if on_period is not None:
+            on_period(rows, period, f, balance, interest, repaid)
+
+    totals['total_interest'][rows] = total_interest
+    totals['total_principal'][rows] = total_principal
+    totals['payoff_years'][rows] = payoff_period / f
+    totals['io_payment'][rows] = np.maximum(0, principal - offset_balance) * period_rate * (io_periods > 0)
+    totals['pi_payment'][rows] = pi_payment
+    totals['final_balance'][rows] = np.where(balance > PAID_OFF, balance, 0)
+
+
+def amortise_portfolio(principal, interest_rate, term_years=calc_engine.DEFAULT_TERM_YEARS, io_years=0,
+                       offset_balance=0, offset_contribution=0, extra_repayment=0,
+                       frequency=DEFAULT_FREQUENCY, chunk_size=DEFAULT_CHUNK_SIZE, on_period=None):
+    """Amortise every loan and aggregate the schedules as they stream
+
+    Returns (totals, yearly). totals is a dict of per-loan arrays: total_interest,
+    total_principal, total_paid, payoff_years, io_payment, pi_payment (per
+    repayment period), final_balance. yearly is a dict of per-year portfolio
+    arrays: interest, principal, balance, offset, loans (still open at year end).
+
+    on_period(rows, period, periods_per_year, balance, interest, principal) is
+    called after every period of every chunk with that chunk's arrays.
+    """
+    principal = np.asarray(principal, dtype=float)
+    n = len(principal)
+
+    def column(value, dtype=float):
+        return np.broadcast_to(np.asarray(value, dtype=dtype), (n,))
+
+    interest_rate = column(interest_rate)
+    term_years = column(term_years)
+    io_years = column(io_years)
+    offset_balance = column(offset_balance)
+    offset_contribution = column(offset_contribution)
+    extra_repayment = column(extra_repayment)
+    frequency = column(frequency, dtype=str)
+
+    unknown = set(np.unique(frequency)) - set(PERIODS_PER_YEAR)
+    if unknown:
+        raise ValueError(f"Unknown repayment frequency: {', '.join(sorted(unknown))}")
+
+    n_years = int(np.ceil(term_years.max())) if n else 0
+    yearly = {key: np.zeros(n_years) for key in ('interest', 'principal', 'balance', 'offset', 'loans')}
+    totals = {key: np.zeros(n) for key in ('total_interest', 'total_principal', 'payoff_years',
+                                           'io_payment', 'pi_payment', 'final_balance')}
+
+    for name, periods_per_year in PERIODS_PER_YEAR.items():
+        group = np.nonzero(frequency == name)[0]
+        for start in range(0, len(group), chunk_size):
+            rows = group[start:start + chunk_size]
+            _amortise_chunk(principal[rows], interest_rate[rows], term_years[rows], io_years[rows],
+                            offset_balance[rows], offset_contribution[rows], extra_repayment[rows],
+                            periods_per_year, totals, yearly, rows, on_period)
+
+    totals['total_paid'] = totals['total_interest'] + totals['total_principal']
+    return totals, yearly
+
+
+def load_loans(csv_path):
+    """Read loan columns from CSV into arrays"""
+    with open(csv_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        raise ValueError(f"No loans found in {csv_path}")
+
+    def column(name, default):
+        return np.array([float(row.get(name) or default) for row in rows])
+
+    return {
+        'principal': column('principal', 0),
+        'interest_rate': column('interest_rate', 0),
+        'term_years': column('term_years', calc_engine.DEFAULT_TERM_YEARS),
+        'io_years': column('io_years', 0),
+        'offset_balance': column('offset_balance', 0),
+        'offset_contribution': column('offset_contribution', 0),
+        'extra_repayment': column('extra_repayment', 0),
+        'frequency': np.array([(row.get('frequency') or DEFAULT_FREQUENCY).lower() for row in rows]),
+    }
+
+
+def demo_loans(n_loans, seed=0):
+    """Synthetic mortgage book with IO periods, offsets, extra repayments and all frequencies"""
+    rng = np.random.default_rng(seed)
+    return {
+        'principal': rng.uniform(200000, 1500000, n_loans),
+        'interest_rate': rng.uniform(0.055, 0.07, n_loans),
+        'term_years': rng.choice([25, 30], n_loans, p=[0.2, 0.8]),
+        'io_years': np.where(rng.random(n_loans) < 0.25, rng.choice([1, 2, 5], n_loans), 0),
+        'offset_balance': np.where(rng.random(n_loans) < 0.4, rng.uniform(0, 100000, n_loans), 0),
+        'offset_contribution': np.where(rng.random(n_loans) < 0.3, rng.uniform(0, 1000, n_loans), 0),
+        'extra_repayment': np.where(rng.random(n_loans) < 0.2, rng.uniform(0, 1500, n_loans), 0),
+        'frequency': rng.choice(list(PERIODS_PER_YEAR), n_loans, p=[0.6, 0.3, 0.1]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk amortisation schedules")
+    parser.add_argument('loans', nargs='?', help="CSV of loans")
+    parser.add_argument('--demo', type=int, help="Use N synthetic loans instead of a CSV")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--output', help="Write per-loan totals to CSV")
+    parser.add_argument('--yearly', help="Write per-year portfolio totals to CSV")
+    args = parser.parse_args()
+
+    if args.demo:
+        loans = demo_loans(args.demo)
+    elif args.loans:
+        loans = load_loans(args.loans)
+    else:
+        parser.error("Provide a loans CSV or --demo N")
+
+    n_loans = len(loans['principal'])
+    print(f"Amortisation Engine - {n_loans} loans")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    totals, yearly = amortise_portfolio(**loans, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    print(f"Completed in {elapsed:.2f}s")
+    print(f"Portfolio principal: ${loans['principal'].sum():,.0f}")
+    print(f"Lifetime interest:   ${totals['total_interest'].sum():,.0f}")
+    print(f"Median payoff:       {np.median(totals['payoff_years']):.1f} years")
+    for year in (0, 4, 9, 19):
+        if year < len(yearly['balance']):
+            print(f"  Year {year + 1:>2}: balance ${yearly['balance'][year]:,.0f}, "
+                  f"interest ${yearly['interest'][year]:,.0f}, open loans {yearly['loans'][year]:,.0f}")
+
+    if args.output:
+        columns = ['total_interest', 'total_principal', 'total_paid', 'payoff_years',
+                   'io_payment', 'pi_payment', 'final_balance']
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['loan'] + columns)
+            for i in range(n_loans):
+                writer.writerow([i] + [round(totals[column][i], 2) for column in columns])
+        print(f"Results saved to: {args.output}")
+
+    if args.yearly:
+        columns = ['interest', 'principal', 'balance', 'offset', 'loans']
+        with open(args.yearly, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['year'] + columns)
+            for year in range(len(yearly['balance'])):
+                writer.writerow([year + 1] + [round(yearly[column][year], 2) for column in columns])
+        print(f"Yearly totals saved to: {args.yearly}")
+
+    return totals, yearly
+
+
+if __name__ == "__main__":
+    main()
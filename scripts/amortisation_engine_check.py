@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Amortisation Engine Check
+Compares amortise_portfolio against a plain month-by-month loop, one loan at a time
+
+The random book mixes 25 and 30 year terms in the same chunk, interest-only
+loans (including IO for the whole term), offsets with contributions, extra
+repayments and all repayment frequencies. Every loan is also re-run on its
+own, so results that depend on the other loans in a chunk are caught. Exits 1
+on any mismatch; run it after changing amortisation_engine.py.
+
+Usage:
+    python amortisation_engine_check.py [--loans 500] [--seed 1] [--chunk-size 97]
+"""
+
+import argparse
+import math
+import sys
+
+import numpy as np
+
+import amortisation_engine
+
+TOLERANCE = 1e-6  # relative, for float summation order
+
+
+def reference_schedule(principal, interest_rate, term_years, io_years, offset_balance, offset_contribution,
+                       extra_repayment, frequency):
+    """One loan, one period at a time; returns (totals, yearly) for that loan"""
+    f = amortisation_engine.PERIODS_PER_YEAR[frequency]
+    period_rate = interest_rate / f
+    term_periods = round(term_years * f)
+    io_periods = min(round(io_years * f), term_periods)
+
+    balance = principal
+    offset = offset_balance
+    payment = 0.0
+    pi_payment = 0.0
+    total_interest = 0.0
+    total_principal = 0.0
+    payoff_period = 0 if balance <= amortisation_engine.PAID_OFF else term_periods
+    yearly = {}
+
+    for period in range(term_periods):
+        if balance <= amortisation_engine.PAID_OFF:
+            break
+
+        if period == io_periods:
+            months = (term_periods - period) * 12 / f
+            monthly_rate = interest_rate / 12
+            if monthly_rate == 0:
+                monthly = balance / months
+            else:
+                monthly = balance * monthly_rate / (1 - (1 + monthly_rate) ** -months)
+            payment = pi_payment = monthly * 12 / f
+
+        interest = max(0.0, balance - offset) * period_rate
+        scheduled = interest if period < io_periods else payment
+        repaid = min(balance, max(0.0, scheduled - interest) + extra_repayment * 12 / f)
+
+        balance -= repaid
+        offset += offset_contribution * 12 / f
+        total_interest += interest
+        total_principal += repaid
+        if balance <= amortisation_engine.PAID_OFF:
+            payoff_period = period + 1
+
+        year = yearly.setdefault(period // f, {'interest': 0.0, 'principal': 0.0, 'balance': 0.0,
+                                               'offset': 0.0, 'loans': 0})
+        year['interest'] += interest
+        year['principal'] += repaid
+        if (period + 1) % f == 0 and balance > amortisation_engine.PAID_OFF:
+            year['balance'] += balance
+            year['offset'] += offset
+            year['loans'] += 1
+
+    io_payment = max(0.0, principal - offset_balance) * period_rate if io_periods > 0 else 0.0
+    totals = {
+        'total_interest': total_interest,
+        'total_principal': total_principal,
+        'total_paid': total_interest + total_principal,
+        'payoff_years': payoff_period / f,
+        'io_payment': io_payment,
+        'pi_payment': pi_payment,
+        'final_balance': balance if balance > amortisation_engine.PAID_OFF else 0.0,
+    }
+    return totals, yearly
+
+
+def check_loans(n_loans, seed):
+    """Random book exercising every branch of the engine"""
+    loans = amortisation_engine.demo_loans(n_loans, seed)
+    rng = np.random.default_rng(seed + 1)
+    term_years = loans['term_years']
+    # IO for the whole term, IO for part of it, and offsets that cover the whole balance
+    loans['io_years'] = np.where(rng.random(n_loans) < 0.1, term_years, loans['io_years'])
+    loans['offset_balance'] = np.where(rng.random(n_loans) < 0.05, loans['principal'] * 1.1,
+                                       loans['offset_balance'])
+    loans['interest_rate'] = np.where(rng.random(n_loans) < 0.02, 0, loans['interest_rate'])
+    return loans
+
+
+def close(expected, actual):
+    return math.isclose(expected, actual, rel_tol=TOLERANCE, abs_tol=TOLERANCE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check amortisation_engine against a scalar loop")
+    parser.add_argument('--loans', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--chunk-size', type=int, default=97)
+    args = parser.parse_args()
+
+    print("Amortisation Engine Check")
+    print("=" * 60)
+
+    loans = check_loans(args.loans, args.seed)
+    totals, yearly = amortisation_engine.amortise_portfolio(**loans, chunk_size=args.chunk_size)
+
+    columns = ['total_interest', 'total_principal', 'total_paid', 'payoff_years',
+               'io_payment', 'pi_payment', 'final_balance']
+    expected_yearly = {key: np.zeros(len(yearly['balance'])) for key in yearly}
+    mismatches = []
+    isolated_mismatches = []
+
+    for i in range(args.loans):
+        loan = {key: values[i].item() for key, values in loans.items()}
+        expected, loan_yearly = reference_schedule(**loan)
+        for year, values in loan_yearly.items():
+            for key, value in values.items():
+                expected_yearly[key][year] += value
+
+        for column in columns:
+            if not close(expected[column], totals[column][i]):
+                mismatches.append((i, column, expected[column], totals[column][i]))
+
+        # The same loan in a chunk of its own
+        alone, _ = amortisation_engine.amortise_portfolio(**{key: [value] for key, value in loan.items()})
+        for column in columns:
+            if alone[column][0] != totals[column][i]:
+                isolated_mismatches.append((i, column, alone[column][0], totals[column][i]))
+
+    yearly_mismatches = [(year, key, expected_yearly[key][year], yearly[key][year])
+                         for key in yearly for year in range(len(yearly[key]))
+                         if not close(expected_yearly[key][year], yearly[key][year])]
+
+    failures = 0
+    for label, found, details in (
+            ("Per-loan totals vs scalar loop", mismatches, "loan {} {}: expected {}, engine {}"),
+            ("Per-loan totals vs loan run alone", isolated_mismatches, "loan {} {}: alone {}, in chunk {}"),
+            ("Yearly portfolio totals vs scalar loop", yearly_mismatches, "year index {} {}: expected {}, engine {}")):
+        failures += len(found)
+        print(f"{'✅' if not found else '❌'} {label}: {len(found)} mismatches")
+        for mismatch in found[:5]:
+            print("   " + details.format(*mismatch))
+
+    counts = {name: int((loans['frequency'] == name).sum()) for name in amortisation_engine.PERIODS_PER_YEAR}
+    io_to_term = int((loans['io_years'] >= loans['term_years']).sum())
+    print(f"\n{args.loans} loans ({', '.join(f'{n} {name}' for name, n in counts.items())}), "
+          f"{io_to_term} IO to term, chunk size {args.chunk_size}")
+
+    if failures:
+        print(f"\n{failures} mismatches (seed {args.seed})")
+        sys.exit(1)
+    print("\n✅ amortisation_engine matches the scalar loop")
+
+
+if __name__ == "__main__":
+    main()
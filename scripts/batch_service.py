@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Local Batch Evaluation Service
+Serves the calc_engine maths over HTTP (TCP or Unix socket) for back-office scripts
+
+Concurrent requests are coalesced: rows that miss the cache are queued and a
+worker evaluates them in vectorized batches (up to --max-batch rows, waiting at
+most --max-wait-ms for a batch to fill). A row already queued or being evaluated
+for another request is not queued again; the new request waits on the same
+result. Results are cached by canonical input in a bounded LRU.
+
+Every row is validated before any of the request is queued: malformed JSON,
+missing fields, non-finite numbers and flags other than true/false/0/1 are
+rejected with 400. A failure inside a batch evaluation returns 500.
+
+Endpoints:
+    POST /borrowing-power       one row object or a list of rows
+    POST /max-purchase-price    one row object or a list of rows
+    GET  /metrics               latency histograms, batch sizes, cache hit ratio
+
+Usage:
+    python batch_service.py serve [--port 8765 | --socket /tmp/otium.sock]
+    python batch_service.py load-test [--port 8765 | --socket ...] [--requests 20000]
+
+Runs entirely locally; load-test drives a running service with no other services.
+"""
+
+import argparse
+import http.client
+import json
+import math
+import queue
+import random
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import calc_engine
+from max_purchase_price_solver import solve_max_purchase_price
+
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 100000
+DEFAULT_MAX_BATCH = 1024
+DEFAULT_MAX_WAIT_MS = 2.0
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+def _finite(value, name):
+    """float(value), rejecting NaN and infinities (json.loads accepts both)"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be a finite number")
+    return number
+
+
+def _flag(value, name):
+    """A JSON boolean or 0/1 (bool() would read the string "false" as True)"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    raise ValueError(f"{name} must be true, false, 0 or 1")
+
+
+def _borrowing_power_row(row):
+    """Canonical borrowing power input (defaults match calculateBorrowingPower)"""
+    return (
+        round(_finite(row['primary_income'], 'primary_income'), 2),
+        round(_finite(row.get('secondary_income', 0), 'secondary_income'), 2),
+        round(_finite(row.get('living_expenses', 0), 'living_expenses'), 2),
+        round(_finite(row['interest_rate'], 'interest_rate'), 6),
+        int(_finite(row.get('dependents', 0), 'dependents')),
+        _flag(row.get('has_hecs', False), 'has_hecs'),
+        round(_finite(row.get('monthly_liabilities', 0), 'monthly_liabilities'), 2),
+        int(_finite(row.get('term_years', calc_engine.DEFAULT_TERM_YEARS), 'term_years')),
+        _flag(row.get('interest_only', False), 'interest_only'),
+    )
+
+
+def _borrowing_power_batch(rows):
+    columns = list(zip(*rows))
+    result = calc_engine.borrowing_power(
+        np.array(columns[0]), np.array(columns[1]), np.array(columns[2]), np.array(columns[3]),
+        dependents=np.array(columns[4]), has_hecs=np.array(columns[5]),
+        monthly_liabilities=np.array(columns[6]), term_years=np.array(columns[7]),
+        interest_only=np.array(columns[8]),
+    )
+    return [
+        {
+            'max_loan': float(result['max_loan'][i]),
+            'surplus': round(float(result['surplus'][i]), 2),
+            'stressed_rate': round(float(result['stressed_rate'][i]), 6),
+            'net_income': round(float(result['net_income'][i]), 2),
+            'assessed_expenses': float(result['assessed_expenses'][i]),
+        }
+        for i in range(len(rows))
+    ]
+
+
+def _max_purchase_price_row(row):
+    """Canonical max purchase price input"""
+    return (
+        round(_finite(row['borrowing_power'], 'borrowing_power'), 2),
+        round(_finite(row['funds_available'], 'funds_available'), 2),
+        str(row.get('state', calc_engine.DEFAULT_STATE)).upper(),
+        _flag(row.get('first_home_buyer', False), 'first_home_buyer'),
+    )
+
+
+def _max_purchase_price_batch(rows):
+    columns = list(zip(*rows))
+    result = solve_max_purchase_price(np.array(columns[0]), np.array(columns[1]),
+                                      np.array(columns[2]), np.array(columns[3]))
+    return [{key: float(values[i]) for key, values in result.items()} for i in range(len(rows))]
+
+
+# path -> (canonicalise one row, evaluate a list of canonical rows)
+OPERATIONS = {
+    '/borrowing-power': (_borrowing_power_row, _borrowing_power_batch),
+    '/max-purchase-price': (_max_purchase_price_row, _max_purchase_price_batch),
+}
+
+
+class LRUCache:
+    """Thread-safe bounded LRU mapping canonical inputs to results"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class Histogram:
+    """Fixed-bucket histogram (latencies in milliseconds by default)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self.lock:
+            self.counts[index] += 1
+            self.total += value
+
+    def snapshot(self):
+        with self.lock:
+            count = sum(self.counts)
+            labels = [f"le_{bound}" for bound in self.buckets] + ['le_inf']
+            return {
+                'count': count,
+                'mean': round(self.total / count, 3) if count else 0.0,
+                'buckets': dict(zip(labels, self.counts)),
+            }
+
+
+class Batcher:
+    """Coalesces queued rows for one operation into vectorized batches"""
+
+    def __init__(self, evaluate, cache, max_batch, max_wait_ms):
+        self.evaluate = evaluate
+        self.cache = cache
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.pending = queue.Queue()
+        self.batch_sizes = Histogram(buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024))
+        self.batch_latency = Histogram()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, key):
+        future = Future()
+        self.pending.put((key, future))
+        return future
+
+    def _collect(self):
+        batch = [self.pending.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+
+            # Duplicates can still meet here if a key missed the in-flight map in a race
+            waiting = OrderedDict()
+            for key, future in batch:
+                waiting.setdefault(key, []).append(future)
+            keys = list(waiting)
+
+            started = time.perf_counter()
+            try:
+                results = self.evaluate(keys)
+            except Exception as e:
+                for futures in waiting.values():
+                    for future in futures:
+                        future.set_exception(e)
+                continue
+            self.batch_latency.observe((time.perf_counter() - started) * 1000)
+            self.batch_sizes.observe(len(keys))
+
+            for key, result in zip(keys, results):
+                self.cache.put(key, result)
+                for future in waiting[key]:
+                    future.set_result(result)
+
+
+class EvaluationService:
+    """Cache lookups, batch submission and metrics shared by all handlers"""
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, max_batch=DEFAULT_MAX_BATCH,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.caches = {path: LRUCache(cache_size) for path in OPERATIONS}
+        self.batchers = {
+            path: Batcher(evaluate, self.caches[path], max_batch, max_wait_ms)
+            for path, (_, evaluate) in OPERATIONS.items()
+        }
+        self.latency = {path: Histogram() for path in OPERATIONS}
+        # key -> Future for rows queued or being evaluated, so concurrent misses share one evaluation
+        self.in_flight = {path: {} for path in OPERATIONS}
+        self.rows = {path: 0 for path in OPERATIONS}
+        self.errors = 0
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    def _submit(self, path, key):
+        in_flight = self.in_flight[path]
+        with self.lock:
+            future = in_flight.get(key)
+            if future is not None:
+                return future
+            future = self.batchers[path].submit(key)
+            in_flight[key] = future
+
+        # Added outside the lock: the callback runs immediately if the batch already finished
+        def forget(done):
+            with self.lock:
+                if in_flight.get(key) is done:
+                    del in_flight[key]
+
+        future.add_done_callback(forget)
+        return future
+
+    def canonicalise(self, path, rows):
+        """Canonical keys for a request's rows; raises on invalid input"""
+        canonicalise, _ = OPERATIONS[path]
+        return [canonicalise(row) for row in rows]
+
+    def evaluate(self, path, keys):
+        """Results for canonical keys, from the cache or the batch worker"""
+        results = [None] * len(keys)
+        futures = {}
+
+        cache = self.caches[path]
+        for i, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                futures[i] = self._submit(path, key)
+
+        for i, future in futures.items():
+            results[i] = future.result()
+
+        with self.lock:
+            self.rows[path] += len(keys)
+        return results
+
+    def record_error(self):
+        with self.lock:
+            self.errors += 1
+
+    def metrics(self):
+        with self.lock:
+            errors = self.errors
+            rows = dict(self.rows)
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'errors': errors,
+            'operations': {
+                path: {
+                    'rows': rows[path],
+                    'request_latency_ms': self.latency[path].snapshot(),
+                    'batch_latency_ms': self.batchers[path].batch_latency.snapshot(),
+                    'batch_sizes': self.batchers[path].batch_sizes.snapshot(),
+                    'cache': self.caches[path].stats(),
+                }
+                for path in OPERATIONS
+            },
+        }
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """JSON request handler; self.server.service is the EvaluationService"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, allow_nan=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send_json(200, self.server.service.metrics())
+        else:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        service = self.server.service
+        started = time.perf_counter()
+        try:
+            length = int(self.headers['Content-Length'])
+            if length < 0:
+                raise ValueError(length)
+        except (TypeError, ValueError):
+            # The body can't be skipped without a length, so drop the connection after replying
+            self.close_connection = True
+            service.record_error()
+            self._send_json(400, {'error': "Invalid request: a valid Content-Length header is required"})
+            return
+
+        body = self.rfile.read(length)
+        if self.path not in OPERATIONS:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+
+        try:
+            payload = json.loads(body)
+            single = isinstance(payload, dict)
+            keys = service.canonicalise(self.path, [payload] if single else payload)
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            service.record_error()
+            self._send_json(400, {'error': f"Invalid request: {e}"})
+            return
+
+        try:
+            results = service.evaluate(self.path, keys)
+        except Exception as e:
+            service.record_error()
+            self._send_json(500, {'error': f"Evaluation failed: {e}"})
+            return
+
+        try:
+            self._send_json(200, results[0] if single else results)
+        except ValueError as e:
+            # A non-finite result that slipped through; never send bare NaN
+            service.record_error()
+            self._send_json(500, {'error': f"Evaluation failed: {e}"})
+            return
+        service.latency[self.path].observe((time.perf_counter() - started) * 1000)
+
+    def log_message(self, format, *args):
+        pass  # Per-request logging would dominate latency under load
+
+
+class TCPServiceHandler(ServiceHandler):
+    # Headers and body are written separately; Nagle + delayed ACK would add ~40ms
+    disable_nagle_algorithm = True
+
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # The default backlog of 5 resets connections under load
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class UnixServiceHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        request_queue_size = 256
+
+        def get_request(self):
+            request, _ = super().get_request()
+            return request, ('local', 0)  # BaseHTTPRequestHandler expects a (host, port) address
+
+
+def serve(args):
+    """Run the service until interrupted"""
+    service = EvaluationService(args.cache_size, args.max_batch, args.max_wait_ms)
+
+    if args.socket:
+        if not hasattr(socketserver, 'UnixStreamServer'):
+            raise SystemExit("Unix sockets are not supported on this platform; use --port")
+        server = UnixServiceHTTPServer(args.socket, ServiceHandler)
+        where = args.socket
+    else:
+        server = ServiceHTTPServer((args.host, args.port), TCPServiceHandler)
+        where = f"http://{args.host}:{args.port}"
+    server.service = service
+
+    print(f"Batch evaluation service listening on {where}")
+    print(f"Cache size {args.cache_size:,} | max batch {args.max_batch} | max wait {args.max_wait_ms}ms")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket"""
+
+    def __init__(self, socket_path):
+        super().__init__('localhost')
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def _connect(args):
+    if args.socket:
+        return UnixHTTPConnection(args.socket)
+    return http.client.HTTPConnection(args.host, args.port)
+
+
+def _request(connection, method, path, payload=None):
+    body = json.dumps(payload) if payload is not None else None
+    connection.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def load_test(args):
+    """Drive a running service with near-identical borrowing power requests"""
+    rng = random.Random(args.seed)
+    # A limited pool of distinct households mimics repeated back-office inputs
+    pool = [
+        {
+            'primary_income': rng.randrange(60000, 200000, 1000),
+            'secondary_income': rng.choice([0, rng.randrange(40000, 120000, 1000)]),
+            'living_expenses': rng.randrange(1500, 4000, 50),
+            'interest_rate': rng.choice([0.055, 0.0575, 0.06, 0.0625]),
+            'dependents': rng.randint(0, 3),
+            'has_hecs': rng.random() < 0.3,
+        }
+        for _ in range(args.distinct)
+    ]
+    per_worker = args.requests // args.concurrency
+
+    def worker(worker_id):
+        worker_rng = random.Random(args.seed + worker_id)
+        connection = _connect(args)
+        latencies = []
+        for _ in range(per_worker):
+            started = time.perf_counter()
+            status, _ = _request(connection, 'POST', '/borrowing-power', worker_rng.choice(pool))
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                raise RuntimeError(f"Service returned {status}")
+        connection.close()
+        return latencies
+
+    print(f"Load test - {per_worker * args.concurrency:,} requests, {args.concurrency} clients, "
+          f"{args.distinct} distinct inputs")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        latencies = [ms for result in executor.map(worker, range(args.concurrency)) for ms in result]
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} requests/s")
+    for label, q in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+        print(f"Client {label}: {latencies[int(q * (len(latencies) - 1))]:.2f}ms")
+
+    connection = _connect(args)
+    _, metrics = _request(connection, 'GET', '/metrics')
+    connection.close()
+    operation = metrics['operations']['/borrowing-power']
+    print(f"Cache hit ratio: {operation['cache']['hit_ratio']:.1%}")
+    print(f"Batches: {operation['batch_sizes']['count']:,} (mean size {operation['batch_sizes']['mean']:.1f})")
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local batch evaluation service")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name in ('serve', 'load-test'):
+        sub = subparsers.add_parser(name)
+        sub.add_argument('--host', default='127.0.0.1')
+        sub.add_argument('--port', type=int, default=DEFAULT_PORT)
+        sub.add_argument('--socket', help="Unix socket path instead of TCP")
+
+    serve_parser = subparsers.choices['serve']
+    serve_parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE)
+    serve_parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    serve_parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+
+    load_parser = subparsers.choices['load-test']
+    load_parser.add_argument('--requests', type=int, default=20000)
+    load_parser.add_argument('--concurrency', type=int, default=32)
+    load_parser.add_argument('--distinct', type=int, default=2000)
+    load_parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        serve(args)
+    else:
+        load_test(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Vectorized Calculation Engine
+NumPy port of the serviceability maths in src/utils/financialCalculations.js
+
+Every function accepts scalars or NumPy arrays and broadcasts, so batch scripts
+can evaluate whole client books in one call. Results follow the JS functions
+of the same name; see the comment above each function for its counterpart.
+"""
+
+import numpy as np
+
+# Mirrors HECS_HELP_CONFIG_2025_26
+HECS_MINIMUM_THRESHOLD = 67000
+HECS_HIGH_INCOME_THRESHOLD = 179286
+HECS_HIGH_INCOME_RATE = 0.10
+
+# Mirrors HEM_BENCHMARKS
+HEM_BENCHMARKS = {
+    'single': {'base': 24600, 'income_adjustment': 0.12},
+    'couple': {'base': 36000, 'income_adjustment': 0.15},
+    'dependent_cost': 4800,
+}
+HEM_INCOME_THRESHOLD = 70000
+
+DEFAULT_STRESS_BUFFER = 0.03
+DEFAULT_TERM_YEARS = 30
+IO_PERIOD_YEARS = 5
+
+
+def js_round(values):
+    """Round half up like Math.round (np.round rounds half to even)"""
+    return np.floor(np.asarray(values, dtype=float) + 0.5)
+
+
+# calculateAustralianNetIncome (2024-25 brackets, LITO and Medicare levy)
+def australian_net_income(gross_income):
+    """Return (net_income, income_tax, medicare_levy) for gross annual income"""
+    gross = np.asarray(gross_income, dtype=float)
+
+    income_tax = np.select(
+        [gross > 190000, gross > 135000, gross > 45000, gross > 18200],
+        [51638 + (gross - 190000) * 0.45,
+         31288 + (gross - 135000) * 0.37,
+         4288 + (gross - 45000) * 0.30,
+         (gross - 18200) * 0.16],
+        default=0.0,
+    )
+    lito = np.select(
+        [gross <= 37500, gross <= 45000, gross <= 66667],
+        [700.0, 700 - (gross - 37500) * 0.05, 325 - (gross - 45000) * 0.015],
+        default=0.0,
+    )
+    medicare_levy = np.select(
+        [gross > 34027, gross > 27222],
+        [gross * 0.02, (gross - 27222) * 0.10],
+        default=0.0,
+    )
+
+    total_tax = np.maximum(0, income_tax - lito + medicare_levy)
+    return gross - total_tax, np.maximum(0, income_tax - lito), medicare_levy
+
+
+# calculateHECSRepayment (2025-26 marginal system)
+def hecs_repayment(annual_income):
+    """Annual HECS/HELP repayment for each income"""
+    income = np.asarray(annual_income, dtype=float)
+
+    repayment = np.select(
+        [income <= HECS_MINIMUM_THRESHOLD,
+         income >= HECS_HIGH_INCOME_THRESHOLD,
+         income <= 125000],
+        [0.0,
+         income * HECS_HIGH_INCOME_RATE,
+         (income - HECS_MINIMUM_THRESHOLD) * 0.15],
+        default=8700 + (income - 125000) * 0.17,
+    )
+    return js_round(repayment)
+
+
+# calculateHEMExpenses
+def hem_expenses(is_couple, total_income, dependents=0):
+    """Monthly HEM benchmark for each household"""
+    is_couple = np.asarray(is_couple, dtype=bool)
+    total_income = np.asarray(total_income, dtype=float)
+
+    base = np.where(is_couple, HEM_BENCHMARKS['couple']['base'], HEM_BENCHMARKS['single']['base'])
+    adjustment = np.where(is_couple,
+                          HEM_BENCHMARKS['couple']['income_adjustment'],
+                          HEM_BENCHMARKS['single']['income_adjustment'])
+
+    annual = base + np.maximum(0, total_income - HEM_INCOME_THRESHOLD) * adjustment
+    annual = annual + np.maximum(0, dependents) * HEM_BENCHMARKS['dependent_cost']
+    return js_round(annual / 12)
+
+
+# calculateMortgagePayment / calculatePIAfterIO (unrounded)
+def mortgage_payment(principal, annual_rate, term_months):
+    """Monthly P&I payment that clears principal over term_months"""
+    principal = np.asarray(principal, dtype=float)
+    monthly_rate = np.asarray(annual_rate, dtype=float) / 12
+    term_months = np.asarray(term_months, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.power(1 + monthly_rate, term_months)
+        payment = principal * monthly_rate * growth / (growth - 1)
+        flat = principal / term_months
+
+    return np.where(monthly_rate == 0, flat, payment)
+
+
+# calculateLoanFromPayment
+def loan_from_payment(monthly_payment, annual_rate, term_months):
+    """Principal that monthly_payment clears over term_months"""
+    monthly_payment = np.asarray(monthly_payment, dtype=float)
+    monthly_rate = np.asarray(annual_rate, dtype=float) / 12
+    term_months = np.asarray(term_months, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.power(1 + monthly_rate, term_months)
+        loan = monthly_payment * (growth - 1) / (monthly_rate * growth)
+
+    return np.where(monthly_rate == 0, monthly_payment * term_months, loan)
+
+
+def max_loan_from_surplus(surplus, stressed_rate, term_years=DEFAULT_TERM_YEARS, interest_only=False):
+    """Rounded maximum loan the monthly surplus services at the stressed rate"""
+    surplus = np.asarray(surplus, dtype=float)
+    stressed_rate = np.asarray(stressed_rate, dtype=float)
+    term_months = np.asarray(term_years, dtype=float) * 12
+    io_term_months = term_months - IO_PERIOD_YEARS * 12
+    pi_loan = loan_from_payment(surplus, stressed_rate, term_months)
+
+    # IO loans are sized on the IO payment but capped by the P&I payment after the IO period
+    with np.errstate(divide='ignore', invalid='ignore'):
+        io_loan = np.where(stressed_rate == 0, 0, surplus / (stressed_rate / 12))
+    pi_after_io = mortgage_payment(io_loan, stressed_rate, io_term_months)
+    io_max_loan = np.where(pi_after_io > surplus,
+                           loan_from_payment(surplus, stressed_rate, io_term_months), io_loan)
+
+    max_loan = np.where(interest_only, io_max_loan, pi_loan)
+    return js_round(np.where(surplus > 0, max_loan, 0))
+
+
+# calculateBorrowingPower (standard scenario, no pre-calculated net income)
+def borrowing_power(primary_income, secondary_income, living_expenses, interest_rate,
+                    dependents=0, has_hecs=False, monthly_liabilities=0,
+                    stress_buffer=DEFAULT_STRESS_BUFFER, term_years=DEFAULT_TERM_YEARS,
+                    interest_only=False, is_couple=None):
+    """Return a dict of arrays: max_loan, surplus, stressed_rate, net_income, assessed_expenses"""
+    primary_income = np.asarray(primary_income, dtype=float)
+    secondary_income = np.asarray(secondary_income, dtype=float)
+    has_hecs = np.asarray(has_hecs, dtype=bool)
+    if is_couple is None:
+        is_couple = secondary_income > 0
+
+    primary_hecs = np.where(has_hecs, hecs_repayment(primary_income), 0)
+    secondary_hecs = np.where(has_hecs & (secondary_income > 0), hecs_repayment(secondary_income), 0)
+
+    primary_net = australian_net_income(primary_income)[0] - primary_hecs
+    secondary_net = np.where(secondary_income > 0,
+                             australian_net_income(secondary_income)[0] - secondary_hecs, 0)
+    total_net = primary_net + secondary_net
+
+    hem = hem_expenses(is_couple, total_net, dependents)
+    assessed_expenses = np.maximum(living_expenses, hem)
+    surplus = total_net / 12 - (assessed_expenses + monthly_liabilities)
+    stressed_rate = np.asarray(interest_rate, dtype=float) + stress_buffer
+
+    return {
+        'max_loan': max_loan_from_surplus(surplus, stressed_rate, term_years, interest_only),
+        'surplus': np.where(surplus > 0, surplus, 0),
+        'stressed_rate': stressed_rate,
+        'net_income': total_net,
+        'assessed_expenses': assessed_expenses,
+    }
+
+
+# Standard stamp duty brackets from calculate*StampDutyStandard: (lower, base, rate)
+# meaning base + rate * (value - lower) for lower < value <= next lower
+STAMP_DUTY_BRACKETS = {
+    'NSW': [(0, 0, 0.0125), (14000, 175, 0.015), (32000, 445, 0.0175), (85000, 1372.50, 0.035),
+            (319000, 9562.50, 0.045), (1064000, 43087.50, 0.055)],
+    'VIC': [(0, 0, 0.014), (25000, 350, 0.024), (130000, 2870, 0.055), (960000, 48520, 0.065)],
+    'QLD': [(0, 0, 0), (5000, 0, 0.015), (75000, 1050, 0.035), (540000, 17325, 0.045),
+            (1000000, 38025, 0.055)],
+    'WA': [(0, 0, 0.019), (120000, 2280, 0.029), (150000, 3150, 0.039), (360000, 11340, 0.049),
+           (725000, 29225, 0.059)],
+    'SA': [(0, 0, 0.011), (12000, 132, 0.022), (30000, 528, 0.033), (50000, 1188, 0.044),
+           (100000, 3388, 0.05), (200000, 8388, 0.055), (250000, 11138, 0.06), (300000, 14138, 0.065)],
+    'TAS': [(0, 50, 0), (3000, 50, 0.0175), (25000, 435, 0.035), (75000, 2185, 0.04),
+            (200000, 7185, 0.043), (375000, 14710, 0.045)],
+    'ACT': [(0, 0, 0.022), (200000, 4400, 0.045), (300000, 8900, 0.048), (500000, 18500, 0.055)],
+    'NT': [(0, 0, 0)],  # NT has no stamp duty on property purchases
+}
+
+# First home buyer concessions from calculate*StampDuty
+#   taper:    no duty up to 'exempt', duty scaled linearly back to standard by 'taper'
+#   discount: duty multiplied by 'scale' up to 'limit'
+FHB_STAMP_DUTY_CONCESSIONS = {
+    'NSW': {'exempt': 800000, 'taper': 1000000},
+    'VIC': {'exempt': 600000, 'taper': 750000},
+    'QLD': {'exempt': 700000, 'taper': 800000},
+    'WA': {'exempt': 450000, 'taper': 600000},
+    'TAS': {'exempt': 750000, 'taper': 750000},
+    'ACT': {'exempt': 470000, 'taper': 607000},
+    'SA': {'limit': 650000, 'scale': 0.25},
+}
+
+STATES = tuple(STAMP_DUTY_BRACKETS)
+DEFAULT_STATE = 'NSW'
+
+# getLMIRate tiers: (max LVR, rate); LVR above the last tier is not lendable
+LMI_TIERS = [(0.80, 0), (0.85, 0.0045), (0.90, 0.0078), (0.95, 0.0155)]
+MAX_LVR = LMI_TIERS[-1][0]
+LMI_RATE_ABOVE_MAX_LVR = 0.0310
+
+# calculateMortgageRegistrationFee / calculateTransferFee (rounded as in the JS)
+MORTGAGE_REGISTRATION_FEES = {'NSW': 176, 'VIC': 129, 'QLD': 224, 'WA': 175,
+                              'SA': 187, 'TAS': 152, 'ACT': 166, 'NT': 165}
+TRANSFER_FEES = {'NSW': 176, 'VIC': 129, 'QLD': 192, 'WA': 175,
+                 'SA': 170, 'TAS': 135, 'ACT': 153, 'NT': 149}
+DEFAULT_LEGAL_FEES = 1500
+DEFAULT_INSPECTION_FEES = 500
+
+
+def stamp_duty_pieces(state, is_first_home_buyer=False, brackets=None, concessions=None):
+    """Stamp duty as quadratic pieces: (lowers, c0, c1, c2) arrays
+
+    Piece k applies for lowers[k] < value <= lowers[k + 1] and gives the unrounded
+    duty c0 + c1 * value + c2 * value ** 2. brackets and concessions default to
+    STAMP_DUTY_BRACKETS and FHB_STAMP_DUTY_CONCESSIONS.
+    """
+    brackets = STAMP_DUTY_BRACKETS if brackets is None else brackets
+    concessions = FHB_STAMP_DUTY_CONCESSIONS if concessions is None else concessions
+    brackets = brackets.get(state, brackets[DEFAULT_STATE])
+    concession = concessions.get(state) if is_first_home_buyer else None
+
+    breakpoints = {lower for lower, _, _ in brackets}
+    if concession:
+        breakpoints.update(v for k, v in concession.items() if k in ('exempt', 'taper', 'limit'))
+    lowers = np.array(sorted(breakpoints), dtype=float)
+
+    bracket_lowers = np.array([lower for lower, _, _ in brackets], dtype=float)
+    index = np.searchsorted(bracket_lowers, lowers, side='right') - 1
+    rate = np.array([brackets[i][2] for i in index])
+    c0 = np.array([brackets[i][1] - brackets[i][2] * brackets[i][0] for i in index])
+    c1 = rate
+    c2 = np.zeros(len(lowers))
+
+    if concession and 'exempt' in concession:
+        exempt, taper = concession['exempt'], concession['taper']
+        c0, c1 = np.where(lowers < exempt, 0, c0), np.where(lowers < exempt, 0, c1)
+        tapered = (lowers >= exempt) & (lowers < taper)
+        if tapered.any():
+            # (c0 + c1 v) * (v - exempt) / (taper - exempt)
+            width = taper - exempt
+            c0, c1, c2 = (np.where(tapered, -exempt * c0 / width, c0),
+                          np.where(tapered, (c0 - exempt * c1) / width, c1),
+                          np.where(tapered, c1 / width, c2))
+    elif concession:
+        scale = np.where(lowers < concession['limit'], concession['scale'], 1)
+        c0, c1 = c0 * scale, c1 * scale
+
+    return lowers, c0, c1, c2
+
+
+# calculateStampDuty (financialCalculations.js version, with FHB concessions)
+def stamp_duty(property_value, state, is_first_home_buyer=False):
+    """Rounded stamp duty for each value; state and FHB flag may be arrays"""
+    values = np.asarray(property_value, dtype=float)
+    states = np.broadcast_to(np.asarray(state), values.shape)
+    fhb = np.broadcast_to(np.asarray(is_first_home_buyer, dtype=bool), values.shape)
+    duty = np.zeros(values.shape)
+
+    for group_state in np.unique(states):
+        for group_fhb in (False, True):
+            mask = (states == group_state) & (fhb == group_fhb)
+            if not mask.any():
+                continue
+            duty[mask] = duty_from_pieces(stamp_duty_pieces(str(group_state), group_fhb), values[mask])
+
+    return js_round(duty)
+
+
+def duty_from_pieces(pieces, values):
+    """Unrounded stamp duty for values from stamp_duty_pieces output"""
+    lowers, c0, c1, c2 = pieces
+    k = np.clip(np.searchsorted(lowers, values, side='left') - 1, 0, len(lowers) - 1)
+    return np.maximum(0, c0[k] + c1[k] * values + c2[k] * values * values)
+
+
+# getLMIRate
+def lmi_rate(lvr):
+    """LMI premium rate for each LVR (as a fraction, not a percentage)"""
+    lvr = np.asarray(lvr, dtype=float)
+    rate = np.full(lvr.shape, LMI_RATE_ABOVE_MAX_LVR)
+    for max_lvr, tier_rate in reversed(LMI_TIERS):
+        rate = np.where(lvr * 100 <= max_lvr * 100, tier_rate, rate)
+    return rate
+
+
+# calculateLMI
+def lmi(loan_amount, property_value):
+    """Rounded LMI premium for each loan"""
+    loan_amount = np.asarray(loan_amount, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lvr = np.where(property_value > 0, loan_amount / property_value, 0)
+    return js_round(loan_amount * lmi_rate(lvr))
+
+
+def _fee_lookup(fees, state):
+    states = np.asarray(state)
+    lookup = np.vectorize(lambda s: fees.get(str(s), fees[DEFAULT_STATE]), otypes=[float])
+    return lookup(states)
+
+
+def fixed_purchase_fees(state, legal_fees=DEFAULT_LEGAL_FEES, inspection_fees=DEFAULT_INSPECTION_FEES):
+    """Legal, inspection, mortgage registration and transfer fees for each state"""
+    return (legal_fees + inspection_fees
+            + _fee_lookup(MORTGAGE_REGISTRATION_FEES, state) + _fee_lookup(TRANSFER_FEES, state))
+
+
+# calculateUpfrontCosts
+def upfront_costs(property_value, loan_amount, state, is_first_home_buyer=False, include_lmi=True,
+                  legal_fees=DEFAULT_LEGAL_FEES, inspection_fees=DEFAULT_INSPECTION_FEES):
+    """Return a dict of arrays: stamp_duty, lmi, fees, total"""
+    duty = stamp_duty(property_value, state, is_first_home_buyer)
+    premium = np.where(include_lmi, lmi(loan_amount, property_value), 0)
+    fees = fixed_purchase_fees(state, legal_fees, inspection_fees)
+    return {
+        'stamp_duty': duty,
+        'lmi': premium,
+        'fees': fees,
+        'total': duty + premium + fees,
+    }
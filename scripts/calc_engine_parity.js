@@ -0,0 +1,167 @@
+#!/usr/bin/env node
+
+// calc_engine.py Parity Check
+//
+// Evaluates random cases with financialCalculations.js and with the NumPy port in
+// scripts/calc_engine.py (which the batch scripts and the batch service use), and
+// fails if any result differs: borrowing power (P&I and IO), stamp duty, LMI and
+// upfront cost totals. Run it after changing either implementation.
+//
+// Usage:
+//   node scripts/calc_engine_parity.js [--cases 20000] [--seed 1] [--python python3]
+
+import { spawnSync } from 'node:child_process';
+import { fileURLToPath } from 'node:url';
+import {
+  calculateBorrowingPower,
+  calculateStampDuty,
+  calculateLMI,
+  calculateUpfrontCosts
+} from '../src/utils/financialCalculations.js';
+
+const STATES = ['NSW', 'VIC', 'QLD', 'WA', 'SA', 'TAS', 'ACT', 'NT'];
+const SCRIPTS_DIR = fileURLToPath(new URL('.', import.meta.url));
+
+// Reads the cases from stdin and prints calc_engine's results as JSON
+const PYTHON_EVALUATOR = `
+import json, sys
+import numpy as np
+import calc_engine
+
+cases = json.load(sys.stdin)
+bp, costs = cases['borrowing_power'], cases['costs']
+column = lambda rows, key: np.array([row[key] for row in rows])
+
+power = calc_engine.borrowing_power(
+    column(bp, 'primaryIncome'), column(bp, 'secondaryIncome'), column(bp, 'livingExpenses'),
+    column(bp, 'interestRate'), dependents=column(bp, 'dependents'), has_hecs=column(bp, 'hasHECS'),
+    monthly_liabilities=column(bp, 'monthlyLiabilities'), term_years=column(bp, 'termYears'),
+    interest_only=column(bp, 'loanType') == 'interest_only')
+
+value, loan = column(costs, 'propertyValue'), column(costs, 'loanAmount')
+state, fhb = column(costs, 'state'), column(costs, 'isFirstHomeBuyer')
+json.dump({
+    'maxLoan': power['max_loan'].tolist(),
+    'stampDuty': calc_engine.stamp_duty(value, state, fhb).tolist(),
+    'lmi': calc_engine.lmi(loan, value).tolist(),
+    'upfrontTotal': calc_engine.upfront_costs(value, loan, state, fhb)['total'].tolist(),
+}, sys.stdout)
+`;
+
+const parseArgs = (argv) => {
+  const options = { cases: 20000, seed: 1, python: 'python3' };
+  for (let i = 0; i < argv.length; i += 2) {
+    const key = argv[i].replace(/^--/, '');
+    if (!(key in options)) {
+      throw new Error(`Unknown option: ${argv[i]}`);
+    }
+    options[key] = key === 'python' ? argv[i + 1] : Number(argv[i + 1]);
+  }
+  return options;
+};
+
+// Park-Miller generator so a failing seed can be replayed
+const makeRandom = (seed) => {
+  let state = seed % 2147483647 || 1;
+  return () => {
+    state = (state * 16807) % 2147483647;
+    return state / 2147483647;
+  };
+};
+
+const buildCases = (count, random) => {
+  const pick = (values) => values[Math.floor(random() * values.length)];
+  const borrowingPower = [];
+  const costs = [];
+
+  for (let i = 0; i < count; i++) {
+    const secondaryIncome = random() < 0.5 ? Math.round(20000 + random() * 150000) : 0;
+    borrowingPower.push({
+      primaryIncome: Math.round(random() * 300000),
+      secondaryIncome,
+      livingExpenses: Math.round(random() * 6000),
+      interestRate: Math.round((0.04 + random() * 0.04) * 10000) / 10000,
+      dependents: Math.floor(random() * 4),
+      hasHECS: random() < 0.4,
+      monthlyLiabilities: random() < 0.3 ? Math.round(random() * 1500) : 0,
+      termYears: pick([25, 30]),
+      loanType: pick(['principal_interest', 'interest_only']),
+      scenario: secondaryIncome > 0 ? 'couple' : 'single'
+    });
+
+    const propertyValue = Math.round(random() * 3500000);
+    costs.push({
+      propertyValue,
+      loanAmount: Math.round(propertyValue * random() * 1.02),
+      state: pick(STATES),
+      isFirstHomeBuyer: random() < 0.5
+    });
+  }
+
+  return { borrowing_power: borrowingPower, costs };
+};
+
+const evaluateJs = (cases) => ({
+  maxLoan: cases.borrowing_power.map(params => calculateBorrowingPower(params).maxLoan),
+  stampDuty: cases.costs.map(c => calculateStampDuty(c.propertyValue, c.state, c.isFirstHomeBuyer)),
+  lmi: cases.costs.map(c => calculateLMI(c.loanAmount, c.propertyValue)),
+  upfrontTotal: cases.costs.map(c => calculateUpfrontCosts(c.propertyValue, c.loanAmount, {
+    state: c.state,
+    isFirstHomeBuyer: c.isFirstHomeBuyer
+  }).total)
+});
+
+const evaluatePython = (cases, python) => {
+  const result = spawnSync(python, ['-c', PYTHON_EVALUATOR], {
+    cwd: SCRIPTS_DIR,
+    input: JSON.stringify(cases),
+    maxBuffer: 256 * 1024 * 1024,
+    encoding: 'utf8'
+  });
+  if (result.status !== 0) {
+    throw new Error(`calc_engine evaluation failed: ${result.stderr || result.error}`);
+  }
+  return JSON.parse(result.stdout);
+};
+
+const main = () => {
+  const options = parseArgs(process.argv.slice(2));
+
+  console.log('🔁 calc_engine.py Parity Check');
+  console.log('='.repeat(60));
+
+  const cases = buildCases(options.cases, makeRandom(options.seed));
+
+  // calculateBorrowingPower logs IO debug output on every call
+  const originalLog = console.log;
+  console.log = () => {};
+  let expected;
+  try {
+    expected = evaluateJs(cases);
+  } finally {
+    console.log = originalLog;
+  }
+  const actual = evaluatePython(cases, options.python);
+
+  let failures = 0;
+  for (const [metric, values] of Object.entries(expected)) {
+    const inputs = metric === 'maxLoan' ? cases.borrowing_power : cases.costs;
+    const mismatches = values
+      .map((value, i) => ({ i, value, actual: actual[metric][i] }))
+      .filter(({ value, actual }) => value !== actual);
+
+    failures += mismatches.length;
+    console.log(`${mismatches.length === 0 ? '✅' : '❌'} ${metric}: ${values.length - mismatches.length}/${values.length} match`);
+    mismatches.slice(0, 5).forEach(({ i, value, actual }) => {
+      console.log(`   case ${i} ${JSON.stringify(inputs[i])}: JS ${value}, calc_engine ${actual}`);
+    });
+  }
+
+  if (failures > 0) {
+    console.log(`\n${failures} mismatches (seed ${options.seed})`);
+    process.exit(1);
+  }
+  console.log('\n✅ calc_engine matches financialCalculations.js');
+};
+
+main();
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Vectorized Deposit Timeline Engine
+Bulk months-to-target forecasts for calculateDepositTimeline what-ifs
+
+For every row the savings target is the deposit at the target LVR plus the
+purchase costs for the row's state (stamp duty with FHB concessions, LMI above
+80% LVR and fixed fees from calc_engine) plus any emergency fund.
+
+Savings grow as in calculateDepositTimeline: each month
+    balance = balance * (1 + return_rate / 12) + contribution
+With a constant contribution this has a closed form, so months-to-target is
+solved directly. Rows whose contribution grows each year are stepped month by
+month, vectorized across rows. Like the JS, forecasts stop at 600 months.
+
+Usage:
+    python deposit_timeline_engine.py clients.csv --output forecasts.csv [--timeline balances.npy]
+    python deposit_timeline_engine.py --demo 1000000
+
+Client CSV columns: current_savings, monthly_contribution, return_rate,
+target_price, state, and optionally first_home_buyer, target_lvr (percent,
+default 80), emergency_fund, contribution_growth (annual, default 0).
+"""
+
+import argparse
+import csv
+import time
+
+import numpy as np
+
+import calc_engine
+
+MAX_MONTHS = 600  # calculateDepositTimeline caps the search at 50 years
+DEFAULT_RETURN_RATE = 0.02
+DEFAULT_TARGET_LVR = 80
+
+
+def savings_target(target_price, state, is_first_home_buyer=False, target_lvr=DEFAULT_TARGET_LVR,
+                   emergency_fund=0):
+    """Return a dict of arrays: deposit, stamp_duty, lmi, fees, total"""
+    target_price = np.asarray(target_price, dtype=float)
+    loan = target_price * np.asarray(target_lvr, dtype=float) / 100
+    costs = calc_engine.upfront_costs(target_price, loan, state, is_first_home_buyer,
+                                      include_lmi=np.asarray(target_lvr) > 80)
+    deposit = target_price - loan
+    return {
+        'deposit': deposit,
+        'stamp_duty': costs['stamp_duty'],
+        'lmi': costs['lmi'],
+        'fees': costs['fees'],
+        'total': deposit + costs['total'] + emergency_fund,
+    }
+
+
+def balance_after(current_savings, monthly_contribution, monthly_return, months):
+    """Closed-form balance after whole months with a constant contribution"""
+    growth = np.power(1 + monthly_return, months)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(monthly_return == 0, months, (growth - 1) / monthly_return)
+    return current_savings * growth + monthly_contribution * annuity
+
+
+def _closed_form_months(current_savings, monthly_contribution, monthly_return, target):
+    """Months until balance >= target with a constant contribution (MAX_MONTHS if never)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # S(1+r)^n + C((1+r)^n - 1)/r >= T  <=>  (1+r)^n >= (T + C/r) / (S + C/r)
+        ratio = (target + monthly_contribution / monthly_return) / (current_savings + monthly_contribution / monthly_return)
+        compounding = np.log(ratio) / np.log1p(monthly_return)
+        flat = (target - current_savings) / monthly_contribution
+
+    months = np.where(monthly_return == 0, flat, compounding)
+    months = np.where(np.isfinite(months) & (months >= 0), np.ceil(months - 1e-9), MAX_MONTHS)
+    months = np.clip(months, 1, MAX_MONTHS)
+
+    # Floating point can land a month short of the loop's answer; check and correct
+    short = (months < MAX_MONTHS) & (balance_after(current_savings, monthly_contribution, monthly_return, months) < target)
+    months = np.where(short, months + 1, months)
+    early = (months > 1) & (balance_after(current_savings, monthly_contribution, monthly_return, months - 1) >= target)
+    return np.where(early, months - 1, months)
+
+
+def _stepped_months(current_savings, monthly_contribution, monthly_return, target, contribution_growth):
+    """Month stepping for rows whose contribution grows each year
+
+    Returns (months_to_target, balance in that month).
+    """
+    balance = current_savings.copy()
+    contribution = monthly_contribution.copy()
+    months = np.full(len(balance), MAX_MONTHS, dtype=float)
+    projected = np.zeros(len(balance))
+    pending = np.ones(len(balance), dtype=bool)
+
+    for month in range(1, MAX_MONTHS + 1):
+        balance = balance * (1 + monthly_return) + contribution
+        reached = pending & (balance >= target)
+        months[reached] = month
+        projected[reached] = balance[reached]
+        pending &= ~reached
+        if not pending.any():
+            break
+        if month % 12 == 0:
+            contribution = contribution * (1 + contribution_growth)
+
+    projected[pending] = balance[pending]
+    return months, projected
+
+
+def balance_timeline(current_savings, monthly_contribution, monthly_return, contribution_growth, horizon):
+    """(rows, horizon) matrix of month-end balances"""
+    timeline = np.empty((len(current_savings), horizon))
+    balance = current_savings.copy()
+    contribution = monthly_contribution.copy()
+
+    for month in range(horizon):
+        balance = balance * (1 + monthly_return) + contribution
+        timeline[:, month] = balance
+        if (month + 1) % 12 == 0:
+            contribution = contribution * (1 + contribution_growth)
+
+    return timeline
+
+
+def project_timelines(current_savings, monthly_contribution, target_price, state,
+                      return_rate=DEFAULT_RETURN_RATE, is_first_home_buyer=False,
+                      target_lvr=DEFAULT_TARGET_LVR, emergency_fund=0, contribution_growth=0,
+                      timeline_months=None):
+    """Months-to-target and summary metrics for every row
+
+    Returns a dict of arrays: target, deposit, stamp_duty, lmi, fees,
+    months_to_target, years_to_target, projected_balance, reached. With
+    timeline_months set, 'timeline' holds a (rows, timeline_months) matrix of
+    month-end balances.
+    """
+    current_savings = np.asarray(current_savings, dtype=float)
+    n = len(current_savings)
+    monthly_contribution = np.broadcast_to(np.asarray(monthly_contribution, dtype=float), (n,)).copy()
+    monthly_return = np.broadcast_to(np.asarray(return_rate, dtype=float) / 12, (n,)).copy()
+    contribution_growth = np.broadcast_to(np.asarray(contribution_growth, dtype=float), (n,)).copy()
+
+    target = savings_target(target_price, state, is_first_home_buyer, target_lvr, emergency_fund)
+    total = np.broadcast_to(target['total'], (n,))
+
+    months = np.zeros(n)
+    projected = current_savings.copy()
+    needed = current_savings < total
+    constant = needed & (contribution_growth == 0)
+    growing = needed & (contribution_growth != 0)
+
+    if constant.any():
+        months[constant] = _closed_form_months(current_savings[constant], monthly_contribution[constant],
+                                               monthly_return[constant], total[constant])
+        projected[constant] = balance_after(current_savings[constant], monthly_contribution[constant],
+                                            monthly_return[constant], months[constant])
+    if growing.any():
+        months[growing], projected[growing] = _stepped_months(
+            current_savings[growing], monthly_contribution[growing], monthly_return[growing],
+            total[growing], contribution_growth[growing])
+
+    result = {
+        'target': total,
+        'deposit': target['deposit'],
+        'stamp_duty': target['stamp_duty'],
+        'lmi': target['lmi'],
+        'fees': target['fees'],
+        'months_to_target': months,
+        'years_to_target': calc_engine.js_round(months / 12 * 10) / 10,
+        'projected_balance': calc_engine.js_round(projected),
+        'reached': projected >= total,
+    }
+    if timeline_months:
+        result['timeline'] = balance_timeline(current_savings, monthly_contribution, monthly_return,
+                                              contribution_growth, timeline_months)
+    return result
+
+
+def load_clients(csv_path):
+    """Read client columns from CSV into arrays"""
+    with open(csv_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        raise ValueError(f"No clients found in {csv_path}")
+
+    def column(name, default):
+        return np.array([float(row.get(name) or default) for row in rows])
+
+    return {
+        'current_savings': column('current_savings', 0),
+        'monthly_contribution': column('monthly_contribution', 0),
+        'return_rate': column('return_rate', DEFAULT_RETURN_RATE),
+        'target_price': column('target_price', 0),
+        'state': np.array([(row.get('state') or calc_engine.DEFAULT_STATE).upper() for row in rows]),
+        'first_home_buyer': np.array([str(row.get('first_home_buyer', '')).lower() in ('1', 'true', 'y', 'yes')
+                                      for row in rows]),
+        'target_lvr': column('target_lvr', DEFAULT_TARGET_LVR),
+        'emergency_fund': column('emergency_fund', 0),
+        'contribution_growth': column('contribution_growth', 0),
+    }
+
+
+def demo_clients(n_clients, seed=0):
+    """Synthetic client book across states, rates and savings assumptions"""
+    rng = np.random.default_rng(seed)
+    return {
+        'current_savings': rng.uniform(0, 150000, n_clients),
+        'monthly_contribution': rng.uniform(500, 5000, n_clients),
+        'return_rate': rng.choice([0.0, 0.02, 0.045, 0.05], n_clients),
+        'target_price': rng.uniform(400000, 1500000, n_clients),
+        'state': rng.choice(calc_engine.STATES, n_clients),
+        'first_home_buyer': rng.random(n_clients) < 0.6,
+        'target_lvr': rng.choice([80, 85, 90, 95], n_clients),
+        'emergency_fund': np.zeros(n_clients),
+        'contribution_growth': np.where(rng.random(n_clients) < 0.2, 0.03, 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized deposit timeline projections")
+    parser.add_argument('clients', nargs='?', help="CSV of clients")
+    parser.add_argument('--demo', type=int, help="Use N synthetic clients instead of a CSV")
+    parser.add_argument('--output', help="Write per-client summary metrics to CSV")
+    parser.add_argument('--timeline', help="Write the month-end balance matrix to this .npy file")
+    parser.add_argument('--timeline-months', type=int, default=120)
+    args = parser.parse_args()
+
+    if args.demo:
+        clients = demo_clients(args.demo)
+    elif args.clients:
+        clients = load_clients(args.clients)
+    else:
+        parser.error("Provide a clients CSV or --demo N")
+
+    n_clients = len(clients['current_savings'])
+    print(f"Deposit Timeline Engine - {n_clients} clients")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    results = project_timelines(
+        clients['current_savings'], clients['monthly_contribution'], clients['target_price'],
+        clients['state'], return_rate=clients['return_rate'],
+        is_first_home_buyer=clients['first_home_buyer'], target_lvr=clients['target_lvr'],
+        emergency_fund=clients['emergency_fund'], contribution_growth=clients['contribution_growth'],
+        timeline_months=args.timeline_months if args.timeline else None,
+    )
+    elapsed = time.perf_counter() - started
+
+    months = results['months_to_target']
+    print(f"Completed in {elapsed:.2f}s")
+    print(f"Median months to target: {np.median(months):.0f}")
+    print(f"Clients not reaching target within {MAX_MONTHS // 12} years: {(~results['reached']).sum()}")
+
+    if args.output:
+        columns = ['target', 'deposit', 'stamp_duty', 'lmi', 'fees', 'months_to_target',
+                   'years_to_target', 'projected_balance', 'reached']
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['client'] + columns)
+            for i in range(n_clients):
+                writer.writerow([i] + [results[column][i] for column in columns])
+        print(f"Results saved to: {args.output}")
+
+    if args.timeline:
+        np.save(args.timeline, results['timeline'])
+        print(f"Timeline matrix {results['timeline'].shape} saved to: {args.timeline}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env node
+
+// deposit_timeline_engine.py Parity Check
+//
+// Projects random savers with calculateDepositTimeline and with
+// scripts/deposit_timeline_engine.py, and fails if months to target, years to
+// target or projected balance differ. The JS target is built the way the engine
+// builds it: the deposit at the target LVR plus calculateUpfrontCosts (LMI only
+// above 80% LVR) plus the emergency fund. Contributions are constant, since
+// calculateDepositTimeline has no contribution growth. Run it after changing
+// either implementation.
+//
+// Usage:
+//   node scripts/deposit_timeline_parity.js [--cases 20000] [--seed 1] [--python python3]
+
+import { spawnSync } from 'node:child_process';
+import { fileURLToPath } from 'node:url';
+import {
+  calculateDepositTimeline,
+  calculateUpfrontCosts
+} from '../src/utils/financialCalculations.js';
+
+const STATES = ['NSW', 'VIC', 'QLD', 'WA', 'SA', 'TAS', 'ACT', 'NT'];
+const SCRIPTS_DIR = fileURLToPath(new URL('.', import.meta.url));
+
+// Reads the cases from stdin and prints deposit_timeline_engine's results as JSON
+const PYTHON_EVALUATOR = `
+import json, sys
+import numpy as np
+import deposit_timeline_engine
+
+cases = json.load(sys.stdin)
+column = lambda key: np.array([case[key] for case in cases])
+
+result = deposit_timeline_engine.project_timelines(
+    column('currentSavings'), column('monthlyContribution'), column('targetPrice'), column('state'),
+    return_rate=column('returnRate'), is_first_home_buyer=column('isFirstHomeBuyer'),
+    target_lvr=column('targetLvr'), emergency_fund=column('emergencyFund'))
+json.dump({
+    'monthsToTarget': result['months_to_target'].tolist(),
+    'yearsToTarget': result['years_to_target'].tolist(),
+    'projectedBalance': result['projected_balance'].tolist(),
+}, sys.stdout)
+`;
+
+const parseArgs = (argv) => {
+  const options = { cases: 20000, seed: 1, python: 'python3' };
+  for (let i = 0; i < argv.length; i += 2) {
+    const key = argv[i].replace(/^--/, '');
+    if (!(key in options)) {
+      throw new Error(`Unknown option: ${argv[i]}`);
+    }
+    options[key] = key === 'python' ? argv[i + 1] : Number(argv[i + 1]);
+  }
+  return options;
+};
+
+// Park-Miller generator so a failing seed can be replayed
+const makeRandom = (seed) => {
+  let state = seed % 2147483647 || 1;
+  return () => {
+    state = (state * 16807) % 2147483647;
+    return state / 2147483647;
+  };
+};
+
+const buildCases = (count, random) => {
+  const pick = (values) => values[Math.floor(random() * values.length)];
+  const cases = [];
+
+  for (let i = 0; i < count; i++) {
+    cases.push({
+      // Whole dollars: with no shortfall the JS returns currentSavings unrounded
+      currentSavings: Math.round(random() * 200000),
+      // Includes contributions too small to reach the target within the 600 month cap
+      monthlyContribution: random() < 0.05 ? Math.round(random() * 50) : Math.round(100 + random() * 6000),
+      returnRate: pick([0, 0.02, 0.045, 0.05, Math.round(random() * 800) / 10000]),
+      targetPrice: Math.round(300000 + random() * 1700000),
+      state: pick(STATES),
+      isFirstHomeBuyer: random() < 0.5,
+      targetLvr: pick([80, 85, 90, 95]),
+      emergencyFund: random() < 0.3 ? Math.round(random() * 20000) : 0
+    });
+  }
+
+  return cases;
+};
+
+const evaluateJs = (cases) => {
+  const results = cases.map((c) => {
+    const loan = c.targetPrice * c.targetLvr / 100;
+    const costs = calculateUpfrontCosts(c.targetPrice, loan, {
+      state: c.state,
+      isFirstHomeBuyer: c.isFirstHomeBuyer,
+      includeLMI: c.targetLvr > 80
+    });
+    return calculateDepositTimeline({
+      targetDeposit: c.targetPrice - loan + costs.total,
+      currentSavings: c.currentSavings,
+      monthlyContribution: c.monthlyContribution,
+      returnRate: c.returnRate,
+      emergencyFund: c.emergencyFund
+    });
+  });
+
+  return {
+    monthsToTarget: results.map(r => r.monthsToTarget),
+    // No shortfall returns early without yearsToTarget
+    yearsToTarget: results.map(r => r.yearsToTarget ?? 0),
+    projectedBalance: results.map(r => r.projectedBalance)
+  };
+};
+
+const evaluatePython = (cases, python) => {
+  const result = spawnSync(python, ['-c', PYTHON_EVALUATOR], {
+    cwd: SCRIPTS_DIR,
+    input: JSON.stringify(cases),
+    maxBuffer: 256 * 1024 * 1024,
+    encoding: 'utf8'
+  });
+  if (result.status !== 0) {
+    throw new Error(`deposit_timeline_engine evaluation failed: ${result.stderr || result.error}`);
+  }
+  return JSON.parse(result.stdout);
+};
+
+const main = () => {
+  const options = parseArgs(process.argv.slice(2));
+
+  console.log('🔁 deposit_timeline_engine.py Parity Check');
+  console.log('='.repeat(60));
+
+  const cases = buildCases(options.cases, makeRandom(options.seed));
+  const expected = evaluateJs(cases);
+  const actual = evaluatePython(cases, options.python);
+
+  let failures = 0;
+  for (const [metric, values] of Object.entries(expected)) {
+    const mismatches = values
+      .map((value, i) => ({ i, value, actual: actual[metric][i] }))
+      .filter(({ value, actual }) => value !== actual);
+
+    failures += mismatches.length;
+    console.log(`${mismatches.length === 0 ? '✅' : '❌'} ${metric}: ${values.length - mismatches.length}/${values.length} match`);
+    mismatches.slice(0, 5).forEach(({ i, value, actual }) => {
+      console.log(`   case ${i} ${JSON.stringify(cases[i])}: JS ${value}, engine ${actual}`);
+    });
+  }
+
+  if (failures > 0) {
+    console.log(`\n${failures} mismatches (seed ${options.seed})`);
+    process.exit(1);
+  }
+  console.log('\n✅ deposit_timeline_engine matches calculateDepositTimeline');
+};
+
+main();
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Batch Maximum Purchase Price Solver
+Exact maximum purchase price per buyer, including stamp duty, LMI and fees
+
+MaxPurchasePriceCalculator solves one buyer at a time by iterating
+(smartAutoCalculate / calculateFrom* helpers). Stamp duty and LMI are piecewise
+and discontinuous in price, so this solver works on the pieces directly:
+
+  1. For each row, the price axis is split at every stamp duty bracket and FHB
+     concession boundary for its state, and at every price where the loan or its
+     LMI tier changes (borrowing power / LVR tier limits).
+  2. Within a piece the cash required is a polynomial (quadratic at most, inside
+     an FHB taper) that increases with price, so the highest affordable price in
+     that piece is solved in closed form.
+  3. The answer is the highest affordable price over all pieces, rounded down to
+     whole dollars and checked against the rounded costs from calc_engine.
+
+The loan is the best of: all of borrowing power, or the largest loan at the
+80/85/90/95% LVR tier limits (taking a slightly smaller loan can avoid an LMI
+tier jump). Costs follow calculateUpfrontCosts.
+
+Usage:
+    python max_purchase_price_solver.py buyers.csv --output prices.csv
+    python max_purchase_price_solver.py --demo 1000000
+
+Buyer CSV columns: borrowing_power, funds_available, state, first_home_buyer.
+"""
+
+import argparse
+import csv
+import time
+
+import numpy as np
+
+import calc_engine
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Whole-dollar price corrections allowed after rounding stamp duty and LMI
+ROUNDING_WINDOW = 100
+
+
+def _loan_regimes(borrowing_power):
+    """Price ranges where the loan follows one formula, per row
+
+    Returns (lower, upper, A0_loan_term, A1) arrays of shape (rows, regimes) where
+    cash required = A1 * price - A0_loan_term + stamp duty + fees on the range.
+    """
+    B = borrowing_power[:, None]
+    lowers, uppers, loan_terms, slopes = [], [], [], []
+
+    # Loan at an LVR tier limit: loan = lvr * price while that is within borrowing power
+    for max_lvr, rate in calc_engine.LMI_TIERS:
+        lowers.append(np.zeros_like(B))
+        uppers.append(B / max_lvr)
+        loan_terms.append(np.zeros_like(B))
+        slopes.append(np.full_like(B, 1 - max_lvr * (1 - rate)))
+
+    # Loan at full borrowing power: the LMI tier depends on B / price
+    previous_lvr = 0
+    for max_lvr, rate in calc_engine.LMI_TIERS:
+        upper = B / previous_lvr if previous_lvr else np.full_like(B, np.inf)
+        lowers.append(B / max_lvr)
+        uppers.append(upper)
+        loan_terms.append(B * (1 - rate))
+        slopes.append(np.ones_like(B))
+        previous_lvr = max_lvr
+
+    return (np.concatenate(lowers, axis=1), np.concatenate(uppers, axis=1),
+            np.concatenate(loan_terms, axis=1), np.concatenate(slopes, axis=1))
+
+
+def _solve_group(borrowing_power, funds, fees, state, is_first_home_buyer):
+    """Closed-form maximum price for rows sharing one state and FHB status"""
+    piece_lowers, c0, c1, c2 = calc_engine.stamp_duty_pieces(state, is_first_home_buyer)
+    piece_uppers = np.append(piece_lowers[1:], np.inf)
+
+    regime_lo, regime_hi, loan_term, slope = _loan_regimes(borrowing_power)
+
+    # Segments: (rows, regimes, pieces)
+    lo = np.maximum(regime_lo[:, :, None], piece_lowers[None, None, :])
+    hi = np.minimum(regime_hi[:, :, None], piece_uppers[None, None, :])
+
+    # Cash required - funds = a * P^2 + b * P + c on the segment
+    a = np.broadcast_to(c2[None, None, :], lo.shape)
+    b = slope[:, :, None] + c1[None, None, :]
+    c = (fees[:, None, None] - loan_term[:, :, None] + c0[None, None, :]) - funds[:, None, None]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        discriminant = np.maximum(b * b - 4 * a * c, 0)
+        quadratic_root = (-b + np.sqrt(discriminant)) / (2 * a)
+        linear_root = -c / b
+    root = np.where(a > 0, quadratic_root, linear_root)
+
+    affordable_at_lo = a * lo * lo + b * lo + c <= 0
+    valid = (lo < hi) & affordable_at_lo
+    best = np.where(valid, np.minimum(hi, root), -np.inf)
+    return np.maximum(best.max(axis=(1, 2)), 0)
+
+
+def cash_required(price, borrowing_power, state, is_first_home_buyer, fees):
+    """Exact rounded cash required at each price using the cheapest loan option
+
+    Returns (cash_required, loan_amount).
+    """
+    duty = calc_engine.stamp_duty(price, state, is_first_home_buyer)
+    best_cash = np.full(price.shape, np.inf)
+    best_loan = np.zeros(price.shape)
+
+    for max_lvr, _ in calc_engine.LMI_TIERS:
+        loan = np.minimum(borrowing_power, np.floor(price * max_lvr))
+        cash = price - loan + duty + calc_engine.lmi(loan, price) + fees
+        better = cash < best_cash
+        best_cash = np.where(better, cash, best_cash)
+        best_loan = np.where(better, loan, best_loan)
+
+    return best_cash, best_loan
+
+
+def solve_max_purchase_price(borrowing_power, funds_available, state, is_first_home_buyer=False,
+                             legal_fees=calc_engine.DEFAULT_LEGAL_FEES,
+                             inspection_fees=calc_engine.DEFAULT_INSPECTION_FEES,
+                             chunk_size=DEFAULT_CHUNK_SIZE):
+    """Maximum purchase price for each row
+
+    Returns a dict of arrays: max_price, loan_amount, lvr, stamp_duty, lmi, fees,
+    cash_required.
+    """
+    borrowing_power = np.maximum(np.asarray(borrowing_power, dtype=float), 0)
+    funds = np.asarray(funds_available, dtype=float)
+    n = len(borrowing_power)
+    states = np.broadcast_to(np.asarray(state), (n,))
+    fhb = np.broadcast_to(np.asarray(is_first_home_buyer, dtype=bool), (n,))
+    fees = calc_engine.fixed_purchase_fees(states, legal_fees, inspection_fees)
+
+    price = np.zeros(n)
+    for group_state in np.unique(states):
+        for group_fhb in (False, True):
+            rows = np.nonzero((states == group_state) & (fhb == group_fhb))[0]
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                price[chunk] = _solve_group(borrowing_power[chunk], funds[chunk], fees[chunk],
+                                            str(group_state), group_fhb)
+
+    # Whole dollars, then absorb the rounding of stamp duty, LMI and the loan.
+    # Cash required rises by as little as ~6c per dollar of price, so a dollar or
+    # two of rounding can move the answer by tens of dollars either way.
+    price = np.floor(price)
+    pending = np.nonzero(price > 0)[0]
+    for _ in range(ROUNDING_WINDOW):
+        cash, _ = cash_required(price[pending], borrowing_power[pending], states[pending], fhb[pending], fees[pending])
+        pending = pending[cash > funds[pending]]
+        if not len(pending):
+            break
+        price[pending] -= 1
+
+    pending = np.nonzero(price > 0)[0]
+    for _ in range(ROUNDING_WINDOW):
+        cash, _ = cash_required(price[pending] + 1, borrowing_power[pending], states[pending], fhb[pending], fees[pending])
+        pending = pending[cash <= funds[pending]]
+        if not len(pending):
+            break
+        price[pending] += 1
+
+    cash, loan = cash_required(price, borrowing_power, states, fhb, fees)
+    affordable = (cash <= funds) & (price > 0)
+    price = np.where(affordable, price, 0)
+    loan = np.where(affordable, loan, 0)
+
+    duty = calc_engine.stamp_duty(price, states, fhb)
+    premium = calc_engine.lmi(loan, price)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lvr = np.where(price > 0, loan / price * 100, 0)
+
+    return {
+        'max_price': price,
+        'loan_amount': loan,
+        'lvr': np.round(lvr, 1),
+        'stamp_duty': duty,
+        'lmi': premium,
+        'fees': np.where(affordable, fees, 0),
+        'cash_required': np.where(affordable, price - loan + duty + premium + fees, 0),
+    }
+
+
+def load_buyers(csv_path):
+    """Read buyer columns from CSV into arrays"""
+    with open(csv_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        raise ValueError(f"No buyers found in {csv_path}")
+
+    return {
+        'borrowing_power': np.array([float(row['borrowing_power'] or 0) for row in rows]),
+        'funds_available': np.array([float(row['funds_available'] or 0) for row in rows]),
+        'state': np.array([(row.get('state') or calc_engine.DEFAULT_STATE).upper() for row in rows]),
+        'first_home_buyer': np.array([str(row.get('first_home_buyer', '')).lower() in ('1', 'true', 'y', 'yes')
+                                      for row in rows]),
+    }
+
+
+def demo_buyers(n_buyers, seed=0):
+    """Synthetic client book across all states"""
+    rng = np.random.default_rng(seed)
+    return {
+        'borrowing_power': rng.uniform(200000, 1500000, n_buyers),
+        'funds_available': rng.uniform(20000, 400000, n_buyers),
+        'state': rng.choice(calc_engine.STATES, n_buyers),
+        'first_home_buyer': rng.random(n_buyers) < 0.5,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch maximum purchase price solver")
+    parser.add_argument('buyers', nargs='?', help="CSV of buyers")
+    parser.add_argument('--demo', type=int, help="Use N synthetic buyers instead of a CSV")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--output', help="Write per-buyer results to CSV")
+    args = parser.parse_args()
+
+    if args.demo:
+        buyers = demo_buyers(args.demo)
+    elif args.buyers:
+        buyers = load_buyers(args.buyers)
+    else:
+        parser.error("Provide a buyers CSV or --demo N")
+
+    n_buyers = len(buyers['borrowing_power'])
+    print(f"Max Purchase Price Solver - {n_buyers} buyers")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    results = solve_max_purchase_price(buyers['borrowing_power'], buyers['funds_available'],
+                                       buyers['state'], buyers['first_home_buyer'],
+                                       chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    print(f"Completed in {elapsed:.2f}s ({n_buyers / max(elapsed, 1e-9):,.0f} buyers/s)")
+    print(f"Median max price: ${np.median(results['max_price']):,.0f}")
+    print(f"Buyers paying LMI: {(results['lmi'] > 0).sum()}")
+
+    if args.output:
+        columns = ['max_price', 'loan_amount', 'lvr', 'stamp_duty', 'lmi', 'fees', 'cash_required']
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['buyer'] + columns)
+            for i in range(n_buyers):
+                writer.writerow([i] + [results[column][i] for column in columns])
+        print(f"Results saved to: {args.output}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
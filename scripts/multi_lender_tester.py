@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Multi-Lender Serviceability Calculator Tester
+Runs one scenario set against several lender calculator workbooks concurrently
+
+Each lender workbook is described by a cell map (see QED_CELL_MAP). Scenarios are
+parsed once, every target is evaluated in its own worker process, and the results
+are joined into a single table with one column per lender.
+
+Workbooks are calculated by Excel through COM (as in qed_tester_com.py), one
+Excel instance per worker: openpyxl does not evaluate formulas, so result cells
+read back empty after a save. Requires Windows, Excel and pywin32. A result cell
+that stays empty is reported as an error for that scenario and the run exits 1.
+
+Usage:
+    python multi_lender_tester.py [--targets targets.json] [--scenarios scenarios.json]
+"""
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pythoncom
+import win32com.client
+
+from qed_tester import SCENARIOS
+
+RESULTS_FILE = Path(__file__).resolve().parent.parent / "docs" / "multi_lender_results.json"
+
+# Cell map for the QED serviceability calculator (same layout as qed_tester.py)
+QED_CELL_MAP = {
+    'name': 'QED',
+    'workbook': r"C:\Users\encou\Documents\Project MicroSass\Otium\qed_serviceability_calculator_3_28_may_2025_download_450.xlsm",
+    'sheets': {'single': 'Single income', 'dual': 'Dual income'},
+    # Values written before every scenario so nothing leaks between runs
+    'defaults': {
+        'F8': 0,  # Primary income
+        'I8': 0,  # Secondary income
+        'E3': 0,  # Dependents
+        'B7': 0.055,  # Default rate
+        'F9': "N",  # HECS debt flag primary
+        'I9': "N",  # HECS debt flag secondary
+        'F16': 0,  # HECS debt amount primary
+        'I16': 0,  # HECS debt amount secondary
+        'F10': 0,  # Rental income
+        'F33': 0,  # Current rent
+        'F5': 500000,  # Default loan amount to trigger calc
+    },
+    # Scenario fields written to cells; 'scale' multiplies, 'flag' writes [yes, no]
+    'inputs': [
+        {'cell': 'F8', 'field': 'primary_income'},
+        {'cell': 'I8', 'field': 'secondary_income', 'sheets': ['dual']},
+        {'cell': 'E3', 'field': 'dependents'},
+        {'cell': 'B7', 'field': 'interest_rate', 'scale': 0.01},
+        {'cell': 'F9', 'field': 'hecs_primary', 'flag': ["Y", "N"]},
+        {'cell': 'I9', 'field': 'hecs_secondary', 'flag': ["Y", "N"]},
+        {'cell': 'F16', 'field': 'hecs_primary'},
+        {'cell': 'I16', 'field': 'hecs_secondary'},
+        {'cell': 'F10', 'field': 'rental_income'},
+        {'cell': 'F33', 'field': 'current_rent'},
+    ],
+    'result_cells': {'single': 'F42', 'dual': 'F43'},
+}
+
+REQUIRED_CELL_MAP_KEYS = ('name', 'workbook', 'sheets', 'inputs', 'result_cells')
+
+NUMERIC_FIELDS = (
+    'primary_income', 'secondary_income', 'dependents', 'hecs_primary',
+    'hecs_secondary', 'interest_rate', 'rental_income', 'current_rent',
+)
+
+
+def load_cell_maps(targets_path=None):
+    """Load lender cell maps from a JSON list, defaulting to QED only"""
+
+    if targets_path is None:
+        cell_maps = [QED_CELL_MAP]
+    else:
+        with open(targets_path) as f:
+            cell_maps = json.load(f)
+
+    names = set()
+    for cell_map in cell_maps:
+        missing = [key for key in REQUIRED_CELL_MAP_KEYS if key not in cell_map]
+        if missing:
+            raise ValueError(f"Cell map {cell_map.get('name', '?')} is missing: {', '.join(missing)}")
+        if cell_map['name'] in names:
+            raise ValueError(f"Duplicate lender name in cell maps: {cell_map['name']}")
+        names.add(cell_map['name'])
+
+    return cell_maps
+
+
+def parse_scenarios(scenarios_path=None):
+    """Parse the scenario stream once into plain dicts every target can share"""
+
+    if scenarios_path is None:
+        raw = SCENARIOS
+    else:
+        with open(scenarios_path) as f:
+            raw = json.load(f)
+
+    scenarios = []
+    for item in raw:
+        scenario = dict(item)
+        for field in NUMERIC_FIELDS:
+            scenario[field] = float(scenario.get(field) or 0)
+        scenario['income_mode'] = 'dual' if scenario['secondary_income'] > 0 else 'single'
+        scenarios.append(scenario)
+
+    return scenarios
+
+
+def parse_result_value(cell_value):
+    """Convert a result cell to a number, accepting formatted currency strings"""
+
+    if isinstance(cell_value, (int, float)) and cell_value > 0:
+        return cell_value
+    if isinstance(cell_value, str):
+        cleaned = cell_value.replace('$', '').replace(',', '').replace(' ', '')
+        if cleaned.isdigit():
+            return float(cleaned)
+    return None
+
+
+def write_scenario(ws, cell_map, scenario):
+    """Write one scenario into a COM worksheet according to the cell map"""
+
+    for cell_ref, value in cell_map.get('defaults', {}).items():
+        ws.Range(cell_ref).Value = value
+
+    for spec in cell_map['inputs']:
+        if 'sheets' in spec and scenario['income_mode'] not in spec['sheets']:
+            continue
+        value = scenario.get(spec['field'], 0)
+        if 'flag' in spec:
+            ws.Range(spec['cell']).Value = spec['flag'][0] if value > 0 else spec['flag'][1]
+        elif value or spec['cell'] not in cell_map.get('defaults', {}):
+            ws.Range(spec['cell']).Value = value * spec.get('scale', 1)
+
+
+def evaluate_target(cell_map, scenarios):
+    """Evaluate every scenario against one lender workbook (runs in a worker process)
+
+    Returns (name, results, errors). results maps scenario name to the calculated
+    value (None where that scenario failed) or is None if the workbook could not
+    be opened; errors maps scenario name to the reason.
+    """
+
+    pythoncom.CoInitialize()
+    excel = None
+    results = {}
+    errors = {}
+
+    try:
+        # DispatchEx starts a private Excel instance rather than sharing a running one
+        excel = win32com.client.DispatchEx("Excel.Application")
+        excel.Visible = False
+        excel.DisplayAlerts = False
+        wb = excel.Workbooks.Open(str(Path(cell_map['workbook']).absolute()), ReadOnly=True)
+
+        for scenario in scenarios:
+            try:
+                sheet_name = cell_map['sheets'][scenario['income_mode']]
+                ws = wb.Worksheets(sheet_name)
+                write_scenario(ws, cell_map, scenario)
+                excel.Calculate()
+
+                result_cell = cell_map['result_cells'][scenario['income_mode']]
+                value = parse_result_value(ws.Range(result_cell).Value)
+                if value is None:
+                    raise ValueError(f"{sheet_name}!{result_cell} is empty or not a positive number")
+                results[scenario['name']] = value
+            except Exception as e:
+                results[scenario['name']] = None
+                errors[scenario['name']] = str(e)
+
+        wb.Close(SaveChanges=False)
+
+    except Exception as e:
+        return cell_map['name'], None, {'workbook': str(e)}
+
+    finally:
+        if excel is not None:
+            excel.Quit()
+        pythoncom.CoUninitialize()
+
+    return cell_map['name'], results, errors
+
+
+def run_all_targets(cell_maps, scenarios):
+    """Evaluate all lender targets concurrently and join results per scenario
+
+    Returns (lenders, table, error_count).
+    """
+
+    lender_results = {}
+    error_count = 0
+    with ProcessPoolExecutor(max_workers=len(cell_maps)) as executor:
+        futures = [executor.submit(evaluate_target, cell_map, scenarios) for cell_map in cell_maps]
+        for future in as_completed(futures):
+            name, results, errors = future.result()
+            lender_results[name] = results or {}
+            error_count += len(errors)
+            if results is None:
+                print(f"  {name}: FAILED - {errors['workbook']}")
+                continue
+            print(f"  {name}: {len(scenarios) - len(errors)}/{len(scenarios)} scenarios calculated")
+            for scenario_name, error in errors.items():
+                print(f"    ERROR {scenario_name}: {error}")
+
+    lenders = [cell_map['name'] for cell_map in cell_maps]
+    table = []
+    for scenario in scenarios:
+        row = {
+            'scenario_name': scenario['name'],
+            'our_app_result': scenario.get('our_app_result'),
+        }
+        for lender in lenders:
+            row[lender] = lender_results[lender].get(scenario['name'])
+        table.append(row)
+
+    return lenders, table, error_count
+
+
+def print_table(lenders, table):
+    """Print the joined result table with one column per lender"""
+
+    header = f"{'Scenario':30} | {'Our App':>10} | " + " | ".join(f"{lender[:12]:>12}" for lender in lenders)
+    print(header)
+    print("-" * len(header))
+    for row in table:
+        our_app = f"${row['our_app_result']:,.0f}" if row['our_app_result'] else "-"
+        cells = []
+        for lender in lenders:
+            value = row[lender]
+            cells.append(f"{f'${value:,.0f}' if value else '-':>12}")
+        print(f"{row['scenario_name'][:30]:30} | {our_app:>10} | " + " | ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scenarios against multiple lender calculators")
+    parser.add_argument('--targets', help="JSON file with a list of lender cell maps")
+    parser.add_argument('--scenarios', help="JSON file with a list of scenarios")
+    parser.add_argument('--output', default=str(RESULTS_FILE), help="Where to save the joined results")
+    args = parser.parse_args()
+
+    cell_maps = load_cell_maps(args.targets)
+    scenarios = parse_scenarios(args.scenarios)
+
+    print(f"Multi-Lender Testing - {len(scenarios)} scenarios x {len(cell_maps)} lenders")
+    print("=" * 60)
+
+    lenders, table, error_count = run_all_targets(cell_maps, scenarios)
+
+    print()
+    print_table(lenders, table)
+
+    with open(args.output, 'w') as f:
+        json.dump(table, f, indent=2)
+
+    print(f"\nResults saved to: {args.output}")
+    if error_count:
+        print(f"{error_count} scenario results could not be calculated")
+        sys.exit(1)
+    return table
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env node
+
+// Smart Calculation Permutation Consistency Matrix
+//
+// Runs every locked-field permutation of smartAutoCalculate over a grid of
+// property values, LVRs, states and first home buyer status. Each grid point is
+// an anchor quadruple (propertyValue, lvr, loanAmount, fundsAvailable) built from
+// calculateUpfrontCosts; every strategy is fed two of the four values and must
+// return the other two. Any disagreement beyond tolerance is a violation.
+//
+// Violations are written to a violation index (by default in the system temp
+// directory). Pass --baseline to compare with a previously saved index: new
+// violations, and known violations whose difference moved by more than the
+// tolerance, are listed and the script exits with 1, so a regression in any
+// calculateFrom* strategy shows up in seconds. The committed index in docs/ and
+// the --baseline file are only rewritten with --update-baseline.
+//
+// Usage:
+//   node scripts/permutation_consistency_matrix.js [--output index.json] [--baseline index.json]
+//     [--update-baseline]
+//     [--property-min 300000] [--property-max 2000000] [--property-step 50000]
+//     [--lvr-min 50] [--lvr-max 95] [--lvr-step 2.5] [--borrowing-power 10000000]
+
+import { writeFileSync, readFileSync } from 'node:fs';
+import { tmpdir } from 'node:os';
+import { join, resolve } from 'node:path';
+import { fileURLToPath } from 'node:url';
+import { smartAutoCalculate, calculateUpfrontCosts } from '../src/utils/financialCalculations.js';
+
+const STATES = ['NSW', 'VIC', 'QLD', 'WA', 'SA', 'TAS', 'ACT', 'NT'];
+
+// Locked fields per strategy (see determineCalculationStrategy) and the fields it solves
+const PERMUTATIONS = {
+  PROPERTY_FUNDS: { locked: ['propertyValue', 'fundsAvailable'], solved: ['lvr', 'loanAmount'] },
+  PROPERTY_LVR: { locked: ['propertyValue', 'lvr'], solved: ['loanAmount', 'fundsAvailable'] },
+  FUNDS_LVR: { locked: ['fundsAvailable', 'lvr'], solved: ['propertyValue', 'loanAmount'] },
+  LOAN_PROPERTY: { locked: ['loanAmount', 'propertyValue'], solved: ['lvr', 'fundsAvailable'] },
+  LOAN_LVR: { locked: ['loanAmount', 'lvr'], solved: ['propertyValue', 'fundsAvailable'] },
+  LOAN_FUNDS: { locked: ['loanAmount', 'fundsAvailable'], solved: ['propertyValue', 'lvr'] }
+};
+
+const MONEY_TOLERANCE = 1000; // dollars
+const LVR_TOLERANCE = 0.5; // percentage points
+
+const toleranceFor = (field) => (field === 'lvr' ? LVR_TOLERANCE : MONEY_TOLERANCE);
+
+const COMMITTED_INDEX = fileURLToPath(new URL('../docs/permutation_violation_index.json', import.meta.url));
+const SCRATCH_OUTPUT = join(tmpdir(), 'permutation_violation_index.json');
+
+const parseArgs = (argv) => {
+  const options = {
+    output: null,
+    baseline: null,
+    updateBaseline: false,
+    propertyMin: 300000,
+    propertyMax: 2000000,
+    propertyStep: 50000,
+    lvrMin: 50,
+    lvrMax: 95,
+    lvrStep: 2.5,
+    borrowingPower: 10000000
+  };
+
+  for (let i = 0; i < argv.length; i += 2) {
+    const key = argv[i].replace(/^--/, '').replace(/-([a-z])/g, (_, c) => c.toUpperCase());
+    if (!(key in options)) {
+      throw new Error(`Unknown option: ${argv[i]}`);
+    }
+    if (key === 'updateBaseline') {
+      options.updateBaseline = true;
+      i -= 1; // Flag without a value
+      continue;
+    }
+    options[key] = ['output', 'baseline'].includes(key) ? argv[i + 1] : Number(argv[i + 1]);
+  }
+
+  // --update-baseline rewrites the --baseline file, or the committed index without one
+  if (options.updateBaseline) {
+    options.output = options.baseline ?? COMMITTED_INDEX;
+  }
+  options.output = options.output ?? SCRATCH_OUTPUT;
+
+  return options;
+};
+
+const range = (min, max, step) => {
+  const values = [];
+  for (let value = min; value <= max + 1e-9; value += step) {
+    values.push(Math.round(value * 100) / 100);
+  }
+  return values;
+};
+
+// Anchor quadruple computed directly from calculateUpfrontCosts
+const buildAnchor = (propertyValue, lvr, state, isFirstHomeBuyer) => {
+  const loanAmount = propertyValue * (lvr / 100);
+  const costs = calculateUpfrontCosts(propertyValue, loanAmount, {
+    state,
+    isFirstHomeBuyer,
+    includeLMI: lvr > 80
+  });
+
+  return {
+    propertyValue,
+    lvr,
+    loanAmount: Math.round(loanAmount),
+    fundsAvailable: Math.round(propertyValue - loanAmount + costs.total)
+  };
+};
+
+const violationKey = (violation) => [
+  violation.state,
+  violation.isFirstHomeBuyer ? 'FHB' : 'STD',
+  violation.strategy,
+  violation.propertyValue,
+  violation.lvr,
+  violation.field
+].join('|');
+
+const buildViolationIndex = (options) => {
+  const propertyValues = range(options.propertyMin, options.propertyMax, options.propertyStep);
+  const lvrs = range(options.lvrMin, options.lvrMax, options.lvrStep);
+  const violations = [];
+  const matrix = {};
+  let evaluations = 0;
+  let convergenceFailures = 0;
+
+  // FUNDS_LVR warns on every non-converged point; count them instead
+  const originalWarn = console.warn;
+  console.warn = () => {};
+
+  try {
+    for (const state of STATES) {
+      for (const isFirstHomeBuyer of [false, true]) {
+        const row = `${state}${isFirstHomeBuyer ? ' FHB' : ''}`;
+        matrix[row] = Object.fromEntries(Object.keys(PERMUTATIONS).map(strategy => [strategy, 0]));
+
+        for (const propertyValue of propertyValues) {
+          for (const lvr of lvrs) {
+            const anchor = buildAnchor(propertyValue, lvr, state, isFirstHomeBuyer);
+
+            for (const [strategy, { locked, solved }] of Object.entries(PERMUTATIONS)) {
+              const inputs = Object.fromEntries(locked.map(field => [field, anchor[field]]));
+              const result = smartAutoCalculate(inputs, locked, options.borrowingPower, state, isFirstHomeBuyer);
+              evaluations++;
+              if (result.convergenceFailure) convergenceFailures++;
+
+              for (const field of solved) {
+                const expected = anchor[field];
+                const actual = result[field];
+                const tolerance = toleranceFor(field);
+
+                if (typeof actual !== 'number' || !Number.isFinite(actual) || Math.abs(actual - expected) > tolerance) {
+                  violations.push({
+                    state,
+                    isFirstHomeBuyer,
+                    strategy,
+                    propertyValue,
+                    lvr,
+                    field,
+                    expected,
+                    actual: Number.isFinite(actual) ? actual : null,
+                    difference: Number.isFinite(actual) ? Math.round((actual - expected) * 10) / 10 : null
+                  });
+                  matrix[row][strategy]++;
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  } finally {
+    console.warn = originalWarn;
+  }
+
+  return {
+    generatedAt: new Date().toISOString(),
+    grid: {
+      states: STATES,
+      propertyValues: [options.propertyMin, options.propertyMax, options.propertyStep],
+      lvrs: [options.lvrMin, options.lvrMax, options.lvrStep],
+      borrowingPower: options.borrowingPower,
+      tolerances: { money: MONEY_TOLERANCE, lvr: LVR_TOLERANCE }
+    },
+    evaluations,
+    convergenceFailures,
+    matrix,
+    violations
+  };
+};
+
+// A known violation has drifted when its difference moved by more than the tolerance
+const hasDrifted = (violation, previous) => {
+  if (violation.difference === null || previous.difference === null) {
+    return violation.difference !== previous.difference;
+  }
+  return Math.abs(violation.difference - previous.difference) > toleranceFor(violation.field);
+};
+
+const compareWithBaseline = (index, baseline) => {
+  const baselineByKey = new Map(baseline.violations.map(violation => [violationKey(violation), violation]));
+  const currentKeys = new Set(index.violations.map(violationKey));
+
+  return {
+    introduced: index.violations.filter(violation => !baselineByKey.has(violationKey(violation))),
+    drifted: index.violations.filter(violation => {
+      const previous = baselineByKey.get(violationKey(violation));
+      return previous !== undefined && hasDrifted(violation, previous);
+    }),
+    resolved: baseline.violations.filter(violation => !currentKeys.has(violationKey(violation)))
+  };
+};
+
+const printMatrix = (matrix) => {
+  const strategies = Object.keys(PERMUTATIONS);
+  console.log(`${'State'.padEnd(8)} | ${strategies.map(s => s.padStart(14)).join(' | ')}`);
+  console.log('-'.repeat(11 + strategies.length * 17));
+  for (const [row, counts] of Object.entries(matrix)) {
+    console.log(`${row.padEnd(8)} | ${strategies.map(s => String(counts[s]).padStart(14)).join(' | ')}`);
+  }
+};
+
+const main = () => {
+  const options = parseArgs(process.argv.slice(2));
+
+  // Read the baseline before anything is written, in case it is the output file
+  const baseline = options.baseline ? JSON.parse(readFileSync(options.baseline, 'utf8')) : null;
+  const protectedPaths = [COMMITTED_INDEX, options.baseline].filter(Boolean).map(path => resolve(path));
+  const overwritesBaseline = !options.updateBaseline && protectedPaths.includes(resolve(options.output));
+
+  console.log('🧮 Smart Calculation Permutation Consistency Matrix');
+  console.log('='.repeat(70));
+
+  const started = performance.now();
+  const index = buildViolationIndex(options);
+  const elapsed = (performance.now() - started) / 1000;
+
+  console.log(`Evaluations: ${index.evaluations.toLocaleString()} in ${elapsed.toFixed(1)}s`);
+  console.log(`Convergence failures: ${index.convergenceFailures.toLocaleString()}`);
+  console.log(`Violations: ${index.violations.length.toLocaleString()}\n`);
+  printMatrix(index.matrix);
+
+  if (overwritesBaseline) {
+    console.log(`\nNot overwriting baseline ${options.output}; pass --update-baseline to replace it`);
+  } else {
+    // One violation per line keeps the stored index small and diffable
+    const { violations, ...summary } = index;
+    const body = JSON.stringify(summary, null, 2).replace(/\n}$/, '');
+    writeFileSync(options.output, `${body},\n  "violations": [\n${violations.map(v => `    ${JSON.stringify(v)}`).join(',\n')}\n  ]\n}\n`);
+    console.log(`\nViolation index saved to: ${options.output}`);
+  }
+
+  if (baseline) {
+    const { introduced, drifted, resolved } = compareWithBaseline(index, baseline);
+    const baselineByKey = new Map(baseline.violations.map(v => [violationKey(v), v]));
+
+    console.log(`\n📋 Compared with baseline ${options.baseline}`);
+    console.log(`Resolved violations: ${resolved.length}`);
+    console.log(`New violations: ${introduced.length}`);
+    console.log(`Drifted violations: ${drifted.length}`);
+
+    if (introduced.length > 0 || drifted.length > 0) {
+      introduced.slice(0, 20).forEach(v => {
+        console.log(`❌ ${violationKey(v)}: expected ${v.expected}, got ${v.actual}`);
+      });
+      drifted.slice(0, 20).forEach(v => {
+        const previous = baselineByKey.get(violationKey(v));
+        console.log(`❌ ${violationKey(v)}: difference ${previous.difference} -> ${v.difference}`);
+      });
+      process.exit(1);
+    }
+    console.log('✅ No regressions against baseline');
+  }
+};
+
+main();